@@ -1,8 +1,5 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from scipy.stats import ttest_ind # For the t-test part
+from survey_static import static_snapshot
 
 # --- Streamlit Configuration ---
 st.set_page_config(
@@ -13,332 +10,504 @@ st.set_page_config(
 st.header("Arts Faculty Data Analysis and Visualization 📊", divider="blue")
 
 # ######################################################################
-# --- 1. DATA LOADING FROM URL ---
-url = 'https://raw.githubusercontent.com/izzatimahrup/SV2025/refs/heads/main/arts_student_survey_output.csv'
+# --- 0. FIRST PAINT ---
+# The pre-rendered snapshot of the latest data version (survey_static.py) is
+# drawn before pandas and SciPy are imported below, and removed once the open
+# tab has rendered live. Only a session's first run in a cold process shows it.
+snapshot = static_snapshot()
+
+# Imported after the first paint on purpose: they are most of a cold start
+import pandas as pd
+from survey_data import COHORT_YEARS, DEGREE_LEVELS, PLO_HISTORY_PATH, default_source, load_survey_store, clear_survey_cache, memory_report
+from survey_charts import (
+    GPA_DENSITY_THRESHOLD, academic_year_figure, cached_figure, coaching_gpa_figure, gender_bar_figure,
+    gender_pie_figure, gpa_trajectory_figure, program_gender_figure, program_pie_figure
+)
+from survey_filters import FILTER_COLUMNS, SurveyView, cohort_index
+from survey_hypothesis import cached_batch_group_tests, cached_coaching_resampling
+from survey_likert import cached_likert_summary, likert_diverging_figure
+from survey_plo import PLO_CONFIG, plo_metrics
+from survey_prerender import prerender_in_background
+from survey_schema import FIELDS, resolve_schema
+from survey_stats import RunningMoments, welch_ttest # For the t-test part
+from survey_trajectory import AT_RISK_MIN_SEMESTERS, AT_RISK_SLOPE, at_risk_students, cached_trajectory, semester_fan_figure
+from survey_timing import PANEL_KEY, performance_panel, plotly_chart, reset_timings, timed_section, timer
+
+# ######################################################################
+# --- 1. DATA LOADING ---
+# The local snapshot is served first and the GitHub URL is revalidated in the
+# background (see survey_data.py); the parse is cached process-wide.
+source = default_source()
+
+# Columns are loaded on first use (see SECTION_COLUMNS in survey_data.py):
+# those every run needs (PLO metrics, filter bar, the aggregates cube and the
+# key findings) plus the open tab's, joined onto the one shared copy of the
+# survey. The Likert items are therefore only read once a tab that uses them
+# has been opened.
+BASE_SECTIONS = ['plo', 'filters', 'gender', 'program', 'gpa_comparison', 'coaching', 'academic_year']
+TAB_SECTIONS = {
+    "Gender": ['gender'],
+    "Arts Programs": ['program', 'program_by_gender'],
+    "GPA Comparison": ['gpa_comparison'],
+    "Coaching Centers": ['coaching'],
+    "Academic Years": ['academic_year'],
+    "Evaluation Items": ['likert'],
+    "Group Comparisons": ['group_tests'],
+    "Semester Trajectory": ['trajectory'],
+}
+open_tab = st.session_state.get("section_tab") or next(iter(TAB_SECTIONS))
+SECTIONS = BASE_SECTIONS + [section for section in TAB_SECTIONS[open_tab] if section not in BASE_SECTIONS]
+
+if st.sidebar.button("Reload survey data"):
+    clear_survey_cache()
+
+# Wall time, rows and chart payload per section (survey_timing.py); a full
+# rerun starts a fresh set of measurements
+st.sidebar.toggle("Performance panel", key=PANEL_KEY)
+reset_timings()
 
 try:
-    # Load the CSV directly from the URL and assign it to arts_df
-    arts_df = pd.read_csv(url)
-    st.success("Data loaded successfully from GitHub URL!")
+    # New rows appended to the CSV are folded into the shared store instead of
+    # reloading everything; the run works on one consistent snapshot of it
+    with timer('data', 'load') as timing:
+        survey = load_survey_store(source, sections=SECTIONS)
+        arts_df, data_version, aggregates = survey.frame, survey.data_version, survey.aggregates
+        timing.rows = len(arts_df)
+    st.success(f"Data loaded successfully from {source.label}!")
 except Exception as e:
-    st.error(f"An error occurred while reading the CSV from the URL: {e}")
+    st.error(f"An error occurred while reading the survey CSV: {e}")
     st.stop() # Stop the app if data loading fails
 
-col1,col2,col3,col4 = st.columns(4)
+# Memory saved by the compact dtypes applied at ingest
+footprint = memory_report(data_version)
+if footprint:
+    st.sidebar.caption(
+        f"Survey in memory: {footprint['bytes_before'] / 1e6:.2f} MB as parsed → "
+        f"{footprint['bytes_after'] / 1e6:.2f} MB compacted ({footprint['rows']:,} rows)"
+    )
 
-col1.metric(label="PLO 2", value=f"3.3", help="PLO 2: Cognitive Skill", border=True)
-col1.metric(label="PLO 3", value=f"3.5", help="PLO 3: Digital Skill", border=True)
-col1.metric(label="PLO 4", value=f"4.0", help="PLO 4: Interpersonal Skill", border=True)
-col1.metric(label="PLO 5", value=f"4.3", help="PLO 5: Communication SKill", border=True)
+col1,col2,col3,col4 = st.columns(4)
 
-# 1. GPA Calculations
-gpa_cols = [col for col in arts_df.columns if "semester" in col.lower()]
-arts_df[gpa_cols] = arts_df[gpa_cols].apply(pd.to_numeric, errors='coerce')
-arts_df['Overall_Average_GPA'] = arts_df[gpa_cols].mean(axis=1, skipna=True)
+# PLO scores are the mean Likert answers of the items mapped in PLO_CONFIG
+# (survey_plo.py), computed once per data version; deltas compare with the
+# previous data version
+plo_results = plo_metrics(data_version, arts_df, PLO_HISTORY_PATH)
+for plo, spec in PLO_CONFIG.items():
+    score, delta = plo_results[plo]
+    col1.metric(
+        label=plo,
+        value=f"{score:.1f}",
+        delta=None if delta is None else f"{delta:+.2f}",
+        help=spec['help'],
+        border=True
+    )
 
-# 2. Normalize SSC (5.0 scale) and HSC (5.0 scale) to 4.0 scale
-arts_df['S.S.C (GPA)_norm'] = (pd.to_numeric(arts_df['S.S.C (GPA)'], errors='coerce') / 5.0) * 4.0
-arts_df['H.S.C (GPA)_norm'] = (pd.to_numeric(arts_df['H.S.C (GPA)'], errors='coerce') / 5.0) * 4.0
+# ----------------------------------------------------------------------
+# --- Filter bar ---
+# Filters are answered from per-value bitmaps built once per data version
+# (survey_filters.py). A filtered view gets its own version string, so every
+# cached statistic and figure below is keyed on the view being shown; the
+# filter columns are also dimensions of the aggregates cube.
+index = cohort_index(data_version, arts_df)
+filter_cols = st.columns(len(FILTER_COLUMNS))
+filters = {
+    col: filter_col.multiselect(label, index.values(col), key=f"filter_{label}")
+    for filter_col, (col, label) in zip(filter_cols, FILTER_COLUMNS.items())
+}
 
-# 3. Clean Coaching Center column
-arts_df['Did you ever attend a Coaching center?'] = arts_df['Did you ever attend a Coaching center?'].astype(str).str.strip().str.title()
+with timer('filters', 'select') as timing:
+    # Breakdowns of the view are roll-ups of the sliced cube, not a rescan
+    view = SurveyView(arts_df, index, aggregates, data_version).filter(filters)
+    arts_df, aggregates, view_version = view.df, view.aggregates, view.version
+    timing.rows = len(arts_df)
+if view.filtered and len(arts_df):
+    st.caption(f"Showing {len(arts_df):,} of {len(view.frame):,} students matching the filters.")
 
-# 4. Corrected Academic Year column name
-academic_year_col = 'Bachelor Academic Year in EU' # <-- CHANGED THIS LINE
-# ----------------------------------------------------------------------
 
-st.subheader("Gender Distribution")
+def cohort_selector(key, options=('All', *DEGREE_LEVELS)):
+    """A Bachelor/Masters switch for one section; returns (choice, SurveyView)."""
+    choice = st.radio("Cohort", options, horizontal=True, key=key)
+    if choice == 'All':
+        return choice, view
+    # Degree level is resolved at ingest and indexed like the filter columns
+    return choice, view.filter({FIELDS['degree_level']: [choice]})
 
-# Calculate gender counts for the initial charts
-gender_counts_df = arts_df['Gender'].value_counts().reset_index()
-gender_counts_df.columns = ['Gender', 'Count']
+# Overall_Average_GPA, the 4.0-scale S.S.C/H.S.C GPAs and the cleaned coaching
+# column are precomputed once per data version (derive_metrics in survey_data.py)
 
-st.write("Data summary (Gender Counts):")
-st.dataframe(gender_counts_df, hide_index=True)
+# ######################################################################
+# --- SECTIONS ---
+# Each section is a fragment: it only runs when its tab is open, and its own
+# widgets rerun just that section instead of the whole page.
 
 # ----------------------------------------------------------------------
-## 1. Gender Bar Chart
-
-st.subheader("Gender Distribution: Bar Chart")
-
-fig_bar = px.bar(
-    gender_counts_df,
-    x='Gender',
-    y='Count',
-    title='Distribution of Gender in Arts Faculty (Bar Chart)',
-    color='Gender',
-    labels={'Count': 'Number of Students', 'Gender': 'Student Gender'},
-    template='plotly_white'
-)
+@st.fragment
+@timed_section('gender', rows=lambda: len(arts_df))
+def gender_section():
+    st.subheader("Gender Distribution")
 
-fig_bar.update_layout(
-    xaxis={'categoryorder':'total descending'},
-    margin=dict(t=50, l=0, r=0, b=0)
-)
+    # Calculate gender counts for the initial charts
+    gender_counts_df = aggregates.value_counts('Gender')
 
-st.plotly_chart(fig_bar, use_container_width=True)
+    st.write("Data summary (Gender Counts):")
+    st.dataframe(gender_counts_df, hide_index=True)
 
-# ----------------------------------------------------------------------
-## 2. Gender Pie Chart
+    ## 1. Gender Bar Chart
+    st.subheader("Gender Distribution: Bar Chart")
 
-st.subheader("Gender Distribution: Pie Chart")
+    # Built figures are cached across reruns and sessions (survey_charts.py)
+    fig_bar = cached_figure('gender_bar', view_version, lambda: gender_bar_figure(gender_counts_df))
 
-fig_pie = px.pie(
-    gender_counts_df,
-    names='Gender',
-    values='Count',
-    title='Distribution of Gender in Arts Faculty (Pie Chart)',
-    hole=0.4,
-    color='Gender'
-)
+    plotly_chart('gender', fig_bar, name='gender_bar', width='stretch')
 
-fig_pie.update_traces(
-    textposition='inside',
-    textinfo='percent+label',
-    marker=dict(line=dict(color='#000000', width=1)),
-)
+    ## 2. Gender Pie Chart
+    st.subheader("Gender Distribution: Pie Chart")
 
-fig_pie.update_layout(
-    margin=dict(t=50, l=0, r=0, b=0)
-)
+    fig_pie = cached_figure('gender_pie', view_version, lambda: gender_pie_figure(gender_counts_df))
 
-st.plotly_chart(fig_pie, use_container_width=False)
+    plotly_chart('gender', fig_pie, name='gender_pie', width='content')
 
-st.markdown("---")
-st.header("Advanced Program and Performance Analysis 🔬")
 
 # ----------------------------------------------------------------------
-# --- 3. Pie Chart: Arts Program Distribution ---
-st.subheader("3. Percentage Distribution of Students by Arts Program")
-
-arts_program_counts_df = arts_df['Arts Program'].value_counts().reset_index()
-arts_program_counts_df.columns = ['Arts Program', 'Count']
-
-fig3 = px.pie(
-    arts_program_counts_df,
-    names='Arts Program',
-    values='Count',
-    title='Percentage Distribution of Students by Arts Program',
-    hole=0.3,
-    color_discrete_sequence=px.colors.sequential.Agsunset
-)
-fig3.update_traces(textposition='inside', textinfo='percent+label')
+@st.fragment
+@timed_section('program', rows=lambda: len(arts_df))
+def program_section():
+    # --- 3. Pie Chart: Arts Program Distribution ---
+    st.subheader("3. Percentage Distribution of Students by Arts Program")
 
-st.plotly_chart(fig3, use_container_width=True)
+    arts_program_counts_df = aggregates.value_counts('Arts Program')
 
-# ----------------------------------------------------------------------
-# --- 4. Stacked Bar Chart: Arts Program Distribution by Gender ---
-st.subheader("4. Arts Program Distribution by Gender (Stacked Bar)")
-
-cross_tab_df = pd.crosstab(arts_df['Arts Program'], arts_df['Gender']).reset_index()
-cross_tab_df = cross_tab_df.melt(
-    id_vars='Arts Program',
-    var_name='Gender',
-    value_name='Count'
-)
+    fig3 = cached_figure('program_pie', view_version, lambda: program_pie_figure(arts_program_counts_df))
 
-colors_map = {'Male': '#4A90E2', 'Female': '#FF69B4', 'Non-Binary': '#F7DC6F', 'Other': '#95a5a6'} 
+    plotly_chart('program', fig3, name='program_pie', width='stretch')
 
-fig4 = px.bar(
-    cross_tab_df,
-    x='Arts Program',
-    y='Count',
-    color='Gender',
-    title='Arts Program Distribution by Gender',
-    color_discrete_map=colors_map
-)
+    # --- 4. Stacked Bar Chart: Arts Program Distribution by Gender ---
+    st.subheader("4. Arts Program Distribution by Gender (Stacked Bar)")
 
-fig4.update_layout(
-    xaxis_title='Arts Program',
-    yaxis_title='Number of Students',
-    barmode='stack',
-    uniformtext_minsize=8,
-    uniformtext_mode='hide'
-)
+    cross_tab_df = aggregates.program_gender_long()
 
-st.plotly_chart(fig4, use_container_width=True)
+    fig4 = cached_figure('program_by_gender', view_version, lambda: program_gender_figure(cross_tab_df))
 
-# ----------------------------------------------------------------------
-# --- 5. Line Chart: Normalized GPA Comparison ---
-st.subheader("5. Normalized GPA Comparison: S.S.C → H.S.C → University")
+    plotly_chart('program', fig4, name='program_by_gender', width='stretch')
 
-# Melt the data into long format
-gpa_long = arts_df.melt(
-    value_vars=['S.S.C (GPA)_norm', 'H.S.C (GPA)_norm', 'Overall_Average_GPA'],
-    var_name='Level',
-    value_name='GPA'
-)
 
-level_map = {
-    'S.S.C (GPA)_norm': 'S.S.C (GPA)',
-    'H.S.C (GPA)_norm': 'H.S.C (GPA)',
-    'Overall_Average_GPA': 'University (Avg GPA)'
-}
-gpa_long['Level'] = gpa_long['Level'].replace(level_map)
-gpa_long['Level'] = pd.Categorical(
-    gpa_long['Level'], categories=level_map.values(), ordered=True
-)
+# ----------------------------------------------------------------------
+# --- 5. Line Chart: Normalized GPA Comparison ---
+@st.fragment
+@timed_section('gpa_comparison', rows=lambda: len(arts_df))
+def gpa_comparison_section():
+    st.subheader("5. Normalized GPA Comparison: S.S.C → H.S.C → University")
+    _, cohort = cohort_selector("gpa_cohort")
+
+    # Individual paths are drawn as one trace, or as a density heatmap once the
+    # cohort exceeds GPA_DENSITY_THRESHOLD students (see survey_charts.py)
+    fig5 = cached_figure(
+        'gpa_comparison', cohort.version,
+        lambda: gpa_trajectory_figure(cohort.df, averages=cohort.aggregates.gpa_means()),
+        density_threshold=GPA_DENSITY_THRESHOLD
+    )
+    if len(cohort.df) > GPA_DENSITY_THRESHOLD:
+        st.caption(f"Showing student density: more than {GPA_DENSITY_THRESHOLD:,} students.")
 
-avg_gpa_df = gpa_long.groupby('Level', observed=True)['GPA'].mean().reset_index()
-
-# Create figure using go.Figure for layering
-fig5 = go.Figure()
-
-# Individual Student Trends (Light gray lines)
-for i, row in arts_df.iterrows():
-    gpas = [row['S.S.C (GPA)_norm'], row['H.S.C (GPA)_norm'], row['Overall_Average_GPA']]
-    fig5.add_trace(go.Scatter(
-        x=list(level_map.values()),
-        y=gpas,
-        mode='lines',
-        line=dict(color='gray', width=1),
-        opacity=0.15,
-        showlegend=False
-    ))
-
-# Average GPA Line + Points (Blue line)
-fig5.add_trace(go.Scatter(
-    x=avg_gpa_df['Level'],
-    y=avg_gpa_df['GPA'],
-    mode='lines+markers+text',
-    line=dict(color='royalblue', width=2.5),
-    marker=dict(size=10),
-    text=[f"{gpa:.2f}" for gpa in avg_gpa_df['GPA']],
-    textposition="bottom center",
-    name='Average GPA'
-))
-
-fig5.update_layout(
-    title='Normalized GPA Comparison: S.S.C → H.S.C → University (4.0 Scale)',
-    xaxis_title='Education Level',
-    yaxis_title='Normalized GPA (4.0 Scale)',
-    yaxis_range=[0, 4.1]
-)
-fig5.update_yaxes(tickvals=[0, 1, 2, 3, 4])
+    plotly_chart('gpa_comparison', fig5, name='gpa_comparison', width='stretch')
 
-st.plotly_chart(fig5, use_container_width=True)
 
 # ----------------------------------------------------------------------
 # --- 6. Bar Chart: Average Overall GPA by Coaching Attendance ---
-st.subheader("6. Average Overall GPA: Coaching Center vs Non-Coaching Students")
-
-avg_gpa_overall = arts_df.groupby('Did you ever attend a Coaching center?')['Overall_Average_GPA'].mean().reset_index()
-order = ['Yes', 'No']
+@st.fragment
+@timed_section('coaching', rows=lambda: len(arts_df))
+def coaching_section():
+    st.subheader("6. Average Overall GPA: Coaching Center vs Non-Coaching Students")
+    _, cohort = cohort_selector("coaching_cohort")
+
+    avg_gpa_overall = cohort.aggregates.coaching_means()
+    fig6 = cached_figure('coaching_gpa', cohort.version, lambda: coaching_gpa_figure(avg_gpa_overall))
+
+    plotly_chart('coaching', fig6, name='coaching_gpa', width='stretch')
+
+    # --- Statistical Test Output ---
+    st.caption("Statistical Analysis (T-test)")
+    # The test runs on the per-group count/mean/M2 kept by the aggregates, so it
+    # never filters or copies the student rows
+    empty_group = RunningMoments()
+    yes_group = cohort.aggregates.coaching_gpa.get('Yes', empty_group)
+    no_group = cohort.aggregates.coaching_gpa.get('No', empty_group)
+
+    # Check if both groups have enough samples
+    if yes_group.count > 1 and no_group.count > 1:
+        t_stat, p_value = welch_ttest(yes_group, no_group)
+
+        st.write(f"Average GPA (Coaching Yes): {yes_group.mean:.3f}")
+        st.write(f"Average GPA (Coaching No): {no_group.mean:.3f}")
+        st.write(f"T-statistic = {t_stat:.3f}")
+        st.write(f"P-value = {p_value:.4f}")
+
+        if p_value < 0.05:
+            st.success("✅ The difference between groups is statistically significant (p < 0.05).")
+        else:
+            st.info("⚖️ No statistically significant difference between coaching and non-coaching students.")
+
+        # Distribution-free checks of the same difference (seeded, cached per data
+        # version and resample count)
+        st.caption("Resampling Checks (Bootstrap & Permutation)")
+        n_resamples = st.select_slider("Number of resamples", options=[1000, 5000, 10000, 50000], value=5000)
+        resampling = cached_coaching_resampling(cohort.version, n_resamples, cohort.df)
+        st.write(
+            f"Difference in average GPA (Yes − No) = {resampling['diff']:.3f}, "
+            f"95% bootstrap CI [{resampling['ci_low']:.3f}, {resampling['ci_high']:.3f}]"
+        )
+        st.write(f"Permutation test P-value = {resampling['p_value']:.4f}")
+    else:
+        st.warning("Insufficient data points in one or both coaching groups to perform a reliable T-test.")
 
-palette_colors = {'Yes': '#2ecc71', 'No': '#e74c3c'}
 
-fig6 = px.bar(
-    avg_gpa_overall,
-    x='Did you ever attend a Coaching center?',
-    y='Overall_Average_GPA',
-    title='Average Overall GPA: Coaching Center vs Non-Coaching Students',
-    category_orders={'Did you ever attend a Coaching center?': order},
-    color='Did you ever attend a Coaching center?',
-    color_discrete_map=palette_colors
-)
+# ----------------------------------------------------------------------
+# --- 7. Bar Chart: Distribution of Academic Years ---
+@st.fragment
+@timed_section('academic_year', rows=lambda: len(arts_df))
+def academic_year_section():
+    st.subheader("7. Distribution of Academic Years (Student Count)")
+    cohort_level, cohort = cohort_selector("year_cohort", options=DEGREE_LEVELS)
+
+    # Header variants (spacing, tabs, case) are resolved once per header
+    # (survey_schema.py); each cohort answers its own academic-year question
+    schema = resolve_schema(arts_df.columns)
+    academic_year_col = schema.bachelor_year if cohort_level == 'Bachelor' else schema.masters_year
+
+    if academic_year_col and schema.academic_year:
+        # 1. Count occurrences: a roll-up of the cohort's slice of the cube
+        academic_year_df = cohort.aggregates.value_counts(schema.academic_year)
+        academic_year_df.columns = ['Academic Year', 'Count']
+
+        # 2. Define and apply the correct sequence/ordering
+        year_order = COHORT_YEARS[cohort_level]
+
+        # Apply Categorical type for robust sorting and consistency
+        academic_year_df['Academic Year'] = pd.Categorical(
+            academic_year_df['Academic Year'],
+            categories=year_order,
+            ordered=True
+        )
+        # Filter the DataFrame to only include the defined categories (removes garbage data)
+        academic_year_df = academic_year_df.dropna(subset=['Academic Year']).sort_values('Academic Year')
+
+        # 3. Create the Plotly Bar Chart (labels, colors and layout in survey_charts.py)
+        fig = cached_figure(
+            'academic_year', cohort.version,
+            lambda: academic_year_figure(academic_year_df, year_order, cohort_level),
+            column=academic_year_col
+        )
+
+        # Optional: Display which column was used
+        st.caption(f"Visualization generated using column: **{academic_year_col}**")
+
+        # Display the chart in Streamlit
+        plotly_chart('academic_year', fig, name='academic_year', width='stretch')
 
-fig6.update_traces(texttemplate='%{y:.2f}', textposition='outside')
-fig6.update_layout(
-    xaxis_title='Attended Coaching Center',
-    yaxis_title='Average Overall GPA',
-    yaxis_range=[0, 4]
-)
+    else:
+        st.warning(f"⚠️ Could not find the '{cohort_level} Academic Year in EU' column in the dataset.")
 
-st.plotly_chart(fig6, use_container_width=True)
 
-# --- Statistical Test Output ---
-st.caption("Statistical Analysis (T-test)")
-yes_group = arts_df[arts_df['Did you ever attend a Coaching center?'] == 'Yes']['Overall_Average_GPA'].dropna()
-no_group = arts_df[arts_df['Did you ever attend a Coaching center?'] == 'No']['Overall_Average_GPA'].dropna()
+# ----------------------------------------------------------------------
+# --- 8. Diverging Bar Chart: Survey Evaluation Items ---
+@st.fragment
+@timed_section('likert', rows=lambda: len(arts_df))
+def likert_section():
+    st.subheader("8. Student Evaluation of the Program (Likert Items)")
+
+    # Every item is summarized in one pass over the answer matrix (survey_likert.py)
+    likert_df = cached_likert_summary(view_version, arts_df)
+
+    if len(likert_df):
+        fig8 = cached_figure('likert_items', view_version, lambda: likert_diverging_figure(likert_df))
+        plotly_chart('likert', fig8, name='likert_items', width='stretch')
+
+        st.write("Item summary (sorted by mean score):")
+        st.dataframe(
+            likert_df.sort_values('Mean', ascending=False)[['Item', 'Responses', 'Mean', 'Top 2 Box']],
+            hide_index=True,
+            column_config={
+                'Mean': st.column_config.NumberColumn(format="%.2f"),
+                'Top 2 Box': st.column_config.ProgressColumn(format="percent", min_value=0, max_value=1),
+            }
+        )
+    else:
+        st.warning("⚠️ No Likert evaluation items were found in the dataset.")
 
-# Check if both groups have enough samples
-if len(yes_group) > 1 and len(no_group) > 1:
-    t_stat, p_value = ttest_ind(yes_group, no_group, equal_var=False)
-    
-    st.write(f"Average GPA (Coaching Yes): {yes_group.mean():.3f}")
-    st.write(f"Average GPA (Coaching No): {no_group.mean():.3f}")
-    st.write(f"T-statistic = {t_stat:.3f}")
-    st.write(f"P-value = {p_value:.4f}")
 
-    if p_value < 0.05:
-        st.success("✅ The difference between groups is statistically significant (p < 0.05).")
+# ----------------------------------------------------------------------
+# --- 9. Table: Group Comparisons Across All Metrics ---
+@st.fragment
+@timed_section('group_tests', rows=lambda: len(arts_df))
+def group_tests_section():
+    st.subheader("9. Group Comparisons Across All Metrics (Welch & Mann–Whitney)")
+
+    # Every factor level is tested against the rest of the cohort on every GPA and
+    # Likert metric in vectorized batches (survey_hypothesis.py); q-values are
+    # Benjamini–Hochberg corrected across all tests
+    group_tests_df = cached_batch_group_tests(view_version, arts_df)
+
+    if len(group_tests_df):
+        alpha = 0.05
+        significant_df = group_tests_df[group_tests_df['Welch q'] < alpha].sort_values('Welch q')
+        st.write(
+            f"{len(significant_df)} of {len(group_tests_df)} comparisons are significant "
+            f"after Benjamini–Hochberg correction (q < {alpha})."
+        )
+        show_all = st.toggle("Show all comparisons", value=False)
+        st.dataframe(
+            (group_tests_df.sort_values('Welch q') if show_all else significant_df)[[
+                'Factor', 'Group', 'Metric', 'n (group)', 'n (rest)', 'Mean (group)', 'Mean (rest)',
+                'Welch t', 'Welch q', 'Mann-Whitney q'
+            ]],
+            hide_index=True
+        )
     else:
-        st.info("⚖️ No statistically significant difference between coaching and non-coaching students.")
-else:
-    st.warning("Insufficient data points in one or both coaching groups to perform a reliable T-test.")
+        st.warning("⚠️ Not enough grouping columns with two or more groups to compare.")
 
 
 # ----------------------------------------------------------------------
-# --- 7. Bar Chart: Distribution of Academic Years ---
-st.subheader("7. Distribution of Academic Years (Student Count)")
-
-# Try to find the correct column automatically (using the provided logic)
-academic_year_col = None
-for col in arts_df.columns:
-    if 'academic year' in col.lower() and 'eu' in col.lower():
-        academic_year_col = col
-        break
-
-if academic_year_col:
-    # 1. Count occurrences and convert to DataFrame
-    academic_year_counts = arts_df[academic_year_col].value_counts()
-    academic_year_df = academic_year_counts.reset_index()
-    academic_year_df.columns = ['Academic Year', 'Count']
-
-    # 2. Define and apply the correct sequence/ordering
-    year_order = ['1st Year', '2nd Year', '3rd Year', '4th Year']
-    
-    # Apply Categorical type for robust sorting and consistency
-    academic_year_df['Academic Year'] = pd.Categorical(
-        academic_year_df['Academic Year'],
-        categories=year_order,
-        ordered=True
-    )
-    # Filter the DataFrame to only include the defined categories (removes garbage data)
-    academic_year_df = academic_year_df.dropna(subset=['Academic Year']).sort_values('Academic Year')
-
-
-    # 3. Create the Plotly Bar Chart
-    fig = px.bar(
-        academic_year_df,
-        x='Academic Year',
-        y='Count',
-        title='Distribution of Academic Years for Bachelor Students in Arts Faculty',
-        category_orders={'Academic Year': year_order}, # Ensures correct sorting
-        color='Academic Year',
-        color_discrete_sequence=px.colors.qualitative.Pastel # Using Plotly's Pastel palette
-    )
+# --- 10. Fan Chart: Semester GPA Trajectory ---
+@st.fragment
+@timed_section('trajectory', rows=lambda: len(arts_df))
+def trajectory_section():
+    st.subheader("10. Semester GPA Trajectory")
+
+    # The twelve semester GPAs as one (students × semesters) matrix: cohort
+    # percentiles per semester and a trend line per student (survey_trajectory.py)
+    semester_df, trends_df = cached_trajectory(view_version, arts_df)
+
+    if semester_df['Students'].sum():
+        fig10 = cached_figure('semester_fan', view_version, lambda: semester_fan_figure(semester_df))
+        plotly_chart('trajectory', fig10, name='semester_fan', width='stretch')
+
+        fitted = trends_df.dropna(subset=['Slope'])
+        col_a, col_b, col_c = st.columns(3)
+        col_a.metric("Students with a trend (2+ semesters)", f"{len(fitted):,}")
+        col_b.metric("Median GPA change per semester", f"{fitted['Slope'].median():+.3f}" if len(fitted) else "–")
+        col_c.metric("Students trending down", f"{(fitted['Slope'] < 0).mean():.0%}" if len(fitted) else "–")
+
+        st.dataframe(
+            semester_df.drop(columns='Column'),
+            hide_index=True,
+            column_config={col: st.column_config.NumberColumn(format="%.2f") for col in semester_df.columns if col.startswith(('P', 'Mean'))}
+        )
+
+        # --- At-risk students: declining GPA trend ---
+        # The trend lines are fitted for every student at once and cached per data
+        # version, so changing the threshold only re-filters them
+        st.caption("Students with a declining GPA")
+        slope_threshold = st.slider(
+            "Flag students whose GPA changes by at most (per semester)",
+            min_value=-0.5, max_value=0.0, value=AT_RISK_SLOPE, step=0.01
+        )
+        # Students are numbered by their survey row, whatever the filters
+        at_risk_df = at_risk_students(arts_df, trends_df, slope_threshold, AT_RISK_MIN_SEMESTERS, view.row_numbers)
+        st.write(
+            f"{len(at_risk_df):,} students with {AT_RISK_MIN_SEMESTERS}+ semesters have a GPA trend of "
+            f"{slope_threshold:+.2f} per semester or lower."
+        )
+        st.dataframe(
+            at_risk_df,
+            hide_index=True,
+            column_config={col: st.column_config.NumberColumn(format="%.3f") for col in ['Slope', 'Intercept', 'Volatility', 'Latest GPA']}
+        )
+    else:
+        st.warning("⚠️ No semester GPA columns were found in the dataset.")
 
-    # 4. Add value indicators (count labels above the bars)
-    fig.update_traces(
-        texttemplate='%{y}',           # Use the Y value (Count) as the label text
-        textposition='outside',        # Place the text outside (above) the bar
-        marker_line_color='black',
-        marker_line_width=1.5
-    )
 
-    # 5. Customize Layout
-    fig.update_layout(
-        xaxis_title='Academic Year',
-        yaxis_title='Number of Students',
-        yaxis_range=[0, academic_year_df['Count'].max() * 1.1] # Ensure space for labels
-    )
-    
-    # Optional: Display which column was used
-    st.caption(f"Visualization generated using column: **{academic_year_col}**")
+# ----------------------------------------------------------------------
+# --- Tabs ---
+# With on_change="rerun" Streamlit tracks the open tab, so only that tab's
+# section function runs and only its columns were loaded (TAB_SECTIONS);
+# the first paint costs only the first section.
+PAGE_SECTIONS = list(zip(TAB_SECTIONS, [
+    gender_section,
+    program_section,
+    gpa_comparison_section,
+    coaching_section,
+    academic_year_section,
+    likert_section,
+    group_tests_section,
+    trajectory_section,
+]))
 
-    # Display the chart in Streamlit
-    st.plotly_chart(fig, use_container_width=True)
+st.markdown("---")
+st.header("Advanced Program and Performance Analysis 🔬")
 
+if len(arts_df):
+    tabs = st.tabs([label for label, _ in PAGE_SECTIONS], on_change="rerun", key="section_tab")
+    for tab, (_, render_section) in zip(tabs, PAGE_SECTIONS):
+        with tab:
+            if tab.open:
+                render_section()
 else:
-    st.warning("⚠️ Could not find a suitable 'Academic Year in EU' column in the dataset using the auto-detection logic.")
+    # Every section would only report missing data for an empty view
+    st.warning("⚠️ No students match the filters.")
+
+# The live page now covers the first paint
+if snapshot is not None:
+    snapshot.empty()
 
 st.markdown("---") # Separator line for visual clarity
 st.header("Overall Data Interpretation and Key Findings 🔍")
 
-final_interpretation = """
-The overall analysis of the Arts Faculty data reveals several key insights: the academic population is dominated by **female students** (63 in the summary data) and is heavily concentrated at the entry level, with **79 of the 103 total students** enrolled in the 1st and 2nd years (24 and 55, respectively), suggesting high recent intake or high attrition/transfer rates in later years. Crucially, the data shows **no statistically significant difference** in overall university GPA between students who attended a coaching center ($3.418$) and those who did not ($3.295$), as evidenced by a P-value of $0.2598$, indicating that external coaching does not reliably boost undergraduate academic success. 
-"""
+# The findings are worded from the unfiltered survey, so they follow the data
+# instead of quoting numbers from one snapshot of it
+def key_findings(aggregates):
+    gender_df = aggregates.value_counts(FIELDS['gender'])
+    top_gender, top_count = gender_df.iloc[0]
+    gender_total = int(gender_df['Count'].sum())
+
+    # Masters students answer their own academic-year question, so the years
+    # are counted for the Bachelor cohort only, as in chart 7
+    bachelor = aggregates.filtered({FIELDS['degree_level']: ['Bachelor']})
+    year_counts = dict(bachelor.value_counts(FIELDS['academic_year']).to_numpy())
+    year_counts = {year: int(year_counts.get(year, 0)) for year in COHORT_YEARS['Bachelor']}
+    first_year, second_year = year_counts['1st Year'], year_counts['2nd Year']
+    year_total = sum(year_counts.values())
+
+    findings = (
+        f"The overall analysis of the Arts Faculty data reveals several key insights: the academic population is "
+        f"{'dominated by' if top_count * 2 > gender_total else 'led by'} **{top_gender.lower()} students** "
+        f"({top_count} of {gender_total}) and is "
+        f"{'concentrated at the entry level' if (first_year + second_year) * 2 > year_total else 'spread across the years'}, with "
+        f"**{first_year + second_year} of the {year_total} Bachelor students** with a known academic year enrolled in "
+        f"the 1st and 2nd years ({first_year} and {second_year}, respectively)."
+    )
+
+    coaching_gpa = aggregates.coaching_gpa
+    yes_group, no_group = coaching_gpa.get('Yes', RunningMoments()), coaching_gpa.get('No', RunningMoments())
+    if yes_group.count > 1 and no_group.count > 1:
+        _, p_value = welch_ttest(yes_group, no_group)
+        comparison = (
+            f"in overall university GPA (the mean of the semester GPAs) between students who attended a coaching "
+            f"center (${yes_group.mean:.3f}$) and those who did not (${no_group.mean:.3f}$), with a Welch t-test "
+            f"P-value of ${p_value:.4f}$"
+        )
+        if p_value < 0.05:
+            direction = 'higher' if yes_group.mean > no_group.mean else 'lower'
+            findings += (
+                f" The data shows a **statistically significant difference** {comparison}: students who attended "
+                f"coaching went on to a {direction} average university GPA, although the survey cannot show that "
+                f"coaching caused it."
+            )
+        else:
+            findings += (
+                f" The data shows **no statistically significant difference** {comparison}, indicating that "
+                f"external coaching does not reliably boost undergraduate academic success."
+            )
+    return findings
+
+
+final_interpretation = key_findings(survey.aggregates)
 
 # Use st.markdown to display the text, allowing for formatting like bold text.
 st.markdown(final_interpretation)
+
+# Debug sidebar: this session's section timings, exportable as JSON
+performance_panel(data_version=data_version, view_version=view_version, rows=len(arts_df))
+
+# A data version without a snapshot gets one built in the background, for the
+# next cold start's first paint (survey_prerender.py)
+prerender_in_background(source)
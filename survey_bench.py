@@ -0,0 +1,173 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from survey_data import (
+    BASE_DIR, HAS_PARQUET, SECTION_COLUMNS, LocalFileSource, columns_for, content_hash, derive_metrics,
+    ingest_survey, parquet_path
+)
+from survey_prerender import build_snapshot, chart_builders
+from survey_schema import canonical_header
+from survey_stats import SurveyAggregates, welch_ttest
+from survey_synth import load_template, write_synthetic_csv
+
+# ######################################################################
+# --- SCALING BENCHMARKS ---
+# Times the studentSurvey.py pipeline on synthetic surveys (survey_synth.py)
+# of increasing size: ingest, column-projected load, derivation, aggregates,
+# every chart's construction + JSON serialization (with its payload size), the
+# static first-paint snapshot (survey_prerender.py) and the coaching t-test.
+# Results are written as JSON so two runs can be compared:
+#
+#   python survey_bench.py --rows 1000 10000 100000 --output bench.json
+#   python survey_bench.py --rows 1000 10000 100000 --compare bench.json
+
+DEFAULT_ROWS = [1_000, 10_000, 100_000]
+REGRESSION_TOLERANCE = 1.25  # slower than this × baseline is flagged
+MIN_COMPARED_SECONDS = 0.005  # stages faster than this are too noisy to flag
+
+
+def timed(func, repeat):
+    """(best wall time over `repeat` calls, last result)."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_size(n_rows, workdir, template, seed=0, repeat=3):
+    """Benchmark one survey size; returns a list of result rows."""
+    results = []
+
+    def record(stage, seconds, payload_bytes=None):
+        results.append({'rows': n_rows, 'stage': stage, 'seconds': seconds, 'payload_bytes': payload_bytes})
+        size = f"{payload_bytes / 1e3:10.1f} kB" if payload_bytes is not None else ''
+        print(f"{n_rows:>10,}  {stage:<24}{seconds * 1000:10.1f} ms{size}", file=sys.stderr)
+
+    path = os.path.join(workdir, f'survey_{n_rows}_{seed}.csv')
+    if not os.path.isfile(path):
+        write_synthetic_csv(path, n_rows, seed, template)
+    source = LocalFileSource(path)
+    version = content_hash(source.read_bytes())
+
+    seconds, _ = timed(lambda: ingest_survey(version, source, cache_dir=workdir), repeat)
+    record('ingest', seconds)
+
+    header = [canonical_header(col) for col in pd.read_csv(path, nrows=0).columns]
+    columns = columns_for(list(SECTION_COLUMNS), header)
+    if HAS_PARQUET:
+        load = lambda: pd.read_parquet(parquet_path(version, workdir), columns=columns)
+    else:
+        load = lambda: ingest_survey(version, source, cache_dir=workdir)[columns]
+    seconds, df = timed(load, repeat)
+    record('load', seconds)
+
+    seconds, df = timed(lambda: derive_metrics(df), repeat)
+    record('derive', seconds)
+
+    seconds, aggregates = timed(lambda: SurveyAggregates().add(df), repeat)
+    record('aggregates', seconds)
+
+    for name, build in chart_builders(df, aggregates).items():
+        seconds, fig_json = timed(lambda: build().to_json(), repeat)
+        record(f'chart:{name}', seconds, len(fig_json.encode()))
+
+    static_dir = os.path.join(workdir, 'static')
+    seconds, _ = timed(lambda: build_snapshot(version, df, aggregates, static_dir), repeat)
+    record('snapshot', seconds)
+
+    coaching = aggregates.coaching_gpa
+    if 'Yes' in coaching and 'No' in coaching:
+        seconds, _ = timed(lambda: welch_ttest(coaching['Yes'], coaching['No']), repeat)
+        record('ttest', seconds)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes=DEFAULT_ROWS, workdir=None, seed=0, repeat=3):
+    """Benchmark every size; returns the report dict."""
+    template = load_template()
+    workdir = workdir or tempfile.mkdtemp(prefix='survey_bench_')
+    os.makedirs(workdir, exist_ok=True)
+    results = []
+    for n_rows in sizes:
+        results += bench_size(n_rows, workdir, template, seed, repeat)
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'seed': seed,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare_reports(baseline, current, tolerance=REGRESSION_TOLERANCE):
+    """Print current vs. baseline per (rows, stage); return the regressed stages."""
+    before = {(row['rows'], row['stage']): row for row in baseline['results']}
+    regressions = []
+    print(f"{'rows':>10}  {'stage':<24}{'baseline':>12}{'current':>12}{'ratio':>8}  payload")
+    for row in current['results']:
+        key = (row['rows'], row['stage'])
+        old = before.get(key)
+        if old is None:
+            print(f"{row['rows']:>10,}  {row['stage']:<24}{'—':>12}{row['seconds'] * 1000:>10.1f}ms")
+            continue
+        ratio = row['seconds'] / old['seconds'] if old['seconds'] else float('inf')
+        payload = ''
+        if row['payload_bytes'] is not None and old['payload_bytes']:
+            payload = f"{row['payload_bytes'] / old['payload_bytes']:.2f}x"
+        slower = ratio > tolerance and row['seconds'] > MIN_COMPARED_SECONDS
+        if slower:
+            regressions.append(key)
+        print(
+            f"{row['rows']:>10,}  {row['stage']:<24}{old['seconds'] * 1000:>10.1f}ms"
+            f"{row['seconds'] * 1000:>10.1f}ms{ratio:>7.2f}x  {payload}{'  REGRESSION' if slower else ''}"
+        )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the survey pipeline on synthetic surveys.")
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--workdir', help="where synthetic CSVs and snapshots are kept (reused across runs)")
+    parser.add_argument('--output', help="write the report JSON here")
+    parser.add_argument('--compare', help="baseline report JSON to compare against")
+    parser.add_argument('--tolerance', type=float, default=REGRESSION_TOLERANCE)
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.rows, args.workdir, args.seed, args.repeat)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare_reports(json.load(f), report, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} stage(s) slower than {args.tolerance:.2f}x the baseline.")
+            sys.exit(1)
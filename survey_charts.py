@@ -0,0 +1,343 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st
+
+from survey_schema import FIELDS
+
+# ######################################################################
+# --- CHART BUILDERS ---
+# Figure construction for the sections of studentSurvey.py. Every builder
+# takes the already aggregated data it plots and returns a plotly figure.
+
+# Above this many students chart 5 switches from one line per student to a
+# binned line-density heatmap, so its payload is bounded by the bin count.
+GPA_DENSITY_THRESHOLD = int(os.environ.get("GPA_DENSITY_THRESHOLD", 5000))
+DENSITY_STEPS = 40   # samples along each S.S.C → H.S.C → University transition
+DENSITY_BINS = 60    # GPA bins on the 0–4.1 axis
+GPA_AXIS_MAX = 4.1
+
+GPA_LEVELS = {
+    FIELDS['ssc_gpa_norm']: 'S.S.C (GPA)',
+    FIELDS['hsc_gpa_norm']: 'H.S.C (GPA)',
+    FIELDS['overall_gpa']: 'University (Avg GPA)'
+}
+
+
+def gpa_density_grid(gpas, n_steps=DENSITY_STEPS, n_bins=DENSITY_BINS, y_max=GPA_AXIS_MAX):
+    """Bin every student's piecewise-linear GPA path into a (bins × x) grid.
+
+    `gpas` is an (n_students × n_levels) array. Each transition between two
+    levels is sampled at `n_steps` x positions; at each position all students
+    are interpolated at once and counted with np.bincount, so the cost is
+    O(n_students × n_steps) and the result size is independent of n_students.
+    Returns (x, y_centers, counts).
+    """
+    n_levels = gpas.shape[1]
+    edges = np.linspace(0, y_max, n_bins + 1)
+    t = np.linspace(0, 1, n_steps, endpoint=False)
+    scale = n_bins / y_max
+
+    def bin_counts(y):
+        bins = np.clip((y * scale).astype(np.int64), 0, n_bins - 1)
+        return np.bincount(bins, minlength=n_bins)
+
+    xs, columns = [], []
+    for level in range(n_levels - 1):
+        pair = gpas[:, level:level + 2]
+        pair = pair[~np.isnan(pair).any(axis=1)]
+        start, delta = pair[:, 0], pair[:, 1] - pair[:, 0]
+        for step in t:
+            columns.append(bin_counts(start + step * delta))
+            xs.append(level + step)
+
+    # Close the grid at the last level
+    last = gpas[:, -1]
+    columns.append(bin_counts(last[~np.isnan(last)]))
+    xs.append(n_levels - 1)
+
+    y_centers = (edges[:-1] + edges[1:]) / 2
+    return np.array(xs), y_centers, np.column_stack(columns)
+
+
+def gpa_trajectory_figure(df, level_map=GPA_LEVELS, density_threshold=GPA_DENSITY_THRESHOLD, averages=None):
+    """Chart 5: per-student GPA paths plus the cohort average line.
+
+    `averages` maps each level column to a precomputed mean; missing levels
+    are averaged from `df`.
+    """
+    level_cols = list(level_map.keys())
+    level_labels = list(level_map.values())
+    student_gpas = df[level_cols].to_numpy(dtype=float)
+    n_students, n_levels = student_gpas.shape
+    positions = np.arange(n_levels)
+
+    fig = go.Figure()
+
+    if n_students > density_threshold:
+        # Density mode: a heatmap of how many student paths cross each cell
+        x, y, counts = gpa_density_grid(student_gpas)
+        fig.add_trace(go.Heatmap(
+            x=x,
+            y=y,
+            z=np.where(counts > 0, counts, np.nan),
+            colorscale='Greys',
+            colorbar=dict(title='Students'),
+            hovertemplate='GPA %{y:.2f}<br>Students %{z}<extra></extra>',
+            name='Student density'
+        ))
+    else:
+        # Individual Student Trends (Light gray lines)
+        # All students share one trace: each row contributes its GPAs followed
+        # by a NaN gap, so the figure does not grow by one trace per student.
+        trend_y = np.column_stack([student_gpas, np.full(n_students, np.nan)]).ravel()
+        trend_x = np.tile(np.append(positions, np.nan), n_students)
+
+        # WebGL keeps large cohorts interactive in the browser
+        TrendTrace = go.Scattergl if n_students > 1000 else go.Scatter
+        fig.add_trace(TrendTrace(
+            x=trend_x,
+            y=trend_y,
+            mode='lines',
+            line=dict(color='rgba(128, 128, 128, 0.15)', width=1),
+            connectgaps=False,
+            hoverinfo='skip',
+            showlegend=False
+        ))
+
+    # Average GPA Line + Points (Blue line)
+    averages = averages or {}
+    avg_gpa = np.array([
+        averages[col] if col in averages else np.nanmean(student_gpas[:, i]) if n_students else np.nan
+        for i, col in enumerate(level_cols)
+    ])
+    fig.add_trace(go.Scatter(
+        x=positions,
+        y=avg_gpa,
+        mode='lines+markers+text',
+        line=dict(color='royalblue', width=2.5),
+        marker=dict(size=10),
+        text=[f"{gpa:.2f}" for gpa in avg_gpa],
+        textposition="bottom center",
+        name='Average GPA'
+    ))
+
+    fig.update_layout(
+        title='Normalized GPA Comparison: S.S.C → H.S.C → University (4.0 Scale)',
+        xaxis_title='Education Level',
+        yaxis_title='Normalized GPA (4.0 Scale)',
+        yaxis_range=[0, GPA_AXIS_MAX]
+    )
+    fig.update_xaxes(tickvals=positions, ticktext=level_labels)
+    fig.update_yaxes(tickvals=[0, 1, 2, 3, 4])
+    return fig
+
+
+# ----------------------------------------------------------------------
+# --- 1./2. Gender Bar and Pie Charts ---
+
+def gender_bar_figure(gender_counts_df):
+    fig_bar = px.bar(
+        gender_counts_df,
+        x='Gender',
+        y='Count',
+        title='Distribution of Gender in Arts Faculty (Bar Chart)',
+        color='Gender',
+        labels={'Count': 'Number of Students', 'Gender': 'Student Gender'},
+        template='plotly_white'
+    )
+
+    fig_bar.update_layout(
+        xaxis={'categoryorder':'total descending'},
+        margin=dict(t=50, l=0, r=0, b=0)
+    )
+    return fig_bar
+
+
+def gender_pie_figure(gender_counts_df):
+    fig_pie = px.pie(
+        gender_counts_df,
+        names='Gender',
+        values='Count',
+        title='Distribution of Gender in Arts Faculty (Pie Chart)',
+        hole=0.4,
+        color='Gender'
+    )
+
+    fig_pie.update_traces(
+        textposition='inside',
+        textinfo='percent+label',
+        marker=dict(line=dict(color='#000000', width=1)),
+    )
+
+    fig_pie.update_layout(
+        margin=dict(t=50, l=0, r=0, b=0)
+    )
+    return fig_pie
+
+
+# ----------------------------------------------------------------------
+# --- 3. Pie Chart: Arts Program Distribution ---
+
+def program_pie_figure(arts_program_counts_df):
+    fig3 = px.pie(
+        arts_program_counts_df,
+        names='Arts Program',
+        values='Count',
+        title='Percentage Distribution of Students by Arts Program',
+        hole=0.3,
+        color_discrete_sequence=px.colors.sequential.Agsunset
+    )
+    fig3.update_traces(textposition='inside', textinfo='percent+label')
+    return fig3
+
+
+# ----------------------------------------------------------------------
+# --- 4. Stacked Bar Chart: Arts Program Distribution by Gender ---
+
+GENDER_COLORS = {'Male': '#4A90E2', 'Female': '#FF69B4', 'Non-Binary': '#F7DC6F', 'Other': '#95a5a6'}
+
+
+def program_gender_figure(cross_tab_df, colors_map=GENDER_COLORS):
+    fig4 = px.bar(
+        cross_tab_df,
+        x='Arts Program',
+        y='Count',
+        color='Gender',
+        title='Arts Program Distribution by Gender',
+        color_discrete_map=colors_map
+    )
+
+    fig4.update_layout(
+        xaxis_title='Arts Program',
+        yaxis_title='Number of Students',
+        barmode='stack',
+        uniformtext_minsize=8,
+        uniformtext_mode='hide'
+    )
+    return fig4
+
+
+# ----------------------------------------------------------------------
+# --- 6. Bar Chart: Average Overall GPA by Coaching Attendance ---
+
+COACHING_COLORS = {'Yes': '#2ecc71', 'No': '#e74c3c'}
+
+
+def coaching_gpa_figure(avg_gpa_overall, order=('Yes', 'No'), palette_colors=COACHING_COLORS):
+    fig6 = px.bar(
+        avg_gpa_overall,
+        x=FIELDS['coaching'],
+        y=FIELDS['overall_gpa'],
+        title='Average Overall GPA: Coaching Center vs Non-Coaching Students',
+        category_orders={FIELDS['coaching']: list(order)},
+        color=FIELDS['coaching'],
+        color_discrete_map=palette_colors
+    )
+
+    fig6.update_traces(texttemplate='%{y:.2f}', textposition='outside')
+    fig6.update_layout(
+        xaxis_title='Attended Coaching Center',
+        yaxis_title='Average Overall GPA',
+        yaxis_range=[0, 4]
+    )
+    return fig6
+
+
+# ----------------------------------------------------------------------
+# --- 7. Bar Chart: Distribution of Academic Years ---
+
+def academic_year_figure(academic_year_df, year_order, cohort='Bachelor'):
+    fig = px.bar(
+        academic_year_df,
+        x='Academic Year',
+        y='Count',
+        title=f'Distribution of Academic Years for {cohort} Students in Arts Faculty',
+        category_orders={'Academic Year': year_order}, # Ensures correct sorting
+        color='Academic Year',
+        color_discrete_sequence=px.colors.qualitative.Pastel # Using Plotly's Pastel palette
+    )
+
+    # Add value indicators (count labels above the bars)
+    fig.update_traces(
+        texttemplate='%{y}',           # Use the Y value (Count) as the label text
+        textposition='outside',        # Place the text outside (above) the bar
+        marker_line_color='black',
+        marker_line_width=1.5
+    )
+
+    # Customize Layout
+    fig.update_layout(
+        xaxis_title='Academic Year',
+        yaxis_title='Number of Students',
+        yaxis_range=[0, academic_year_df['Count'].max() * 1.1] # Ensure space for labels
+    )
+    return fig
+
+
+# ######################################################################
+# --- FIGURE CACHE ---
+# Built figures are kept as serialized JSON, keyed on chart name, data
+# version and chart parameters, and shared by every session. The least
+# recently used entries are evicted once the entry or byte cap is reached.
+
+FIGURE_CACHE_MAX_BYTES = int(os.environ.get("FIGURE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+FIGURE_CACHE_MAX_ENTRIES = int(os.environ.get("FIGURE_CACHE_MAX_ENTRIES", 256))
+
+
+class FigureCache:
+    """LRU cache of figure JSON with entry-count and total-size caps."""
+
+    def __init__(self, max_bytes=FIGURE_CACHE_MAX_BYTES, max_entries=FIGURE_CACHE_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(name, data_version, params):
+        return name, data_version, json.dumps(params, sort_keys=True, default=str)
+
+    def get_json(self, name, data_version, params, build):
+        """Return the figure JSON, calling `build()` only on a cache miss."""
+        key = self.key(name, data_version, params)
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+
+        fig_json = build().to_json()
+        with self.lock:
+            if len(fig_json) <= self.max_bytes and key not in self.entries:
+                self.entries[key] = fig_json
+                self.size += len(fig_json)
+                while self.size > self.max_bytes or len(self.entries) > self.max_entries:
+                    _, evicted = self.entries.popitem(last=False)
+                    self.size -= len(evicted)
+        return fig_json
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+
+@st.cache_resource(show_spinner=False)
+def figure_cache():
+    return FigureCache()
+
+
+def cached_figure(name, data_version, build, **params):
+    """The figure `build()` returns for this data version and `params`, from cache if possible."""
+    return pio.from_json(figure_cache().get_json(name, data_version, params, build))
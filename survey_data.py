@@ -0,0 +1,685 @@
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+import time
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from survey_plo import plo_columns
+from survey_schema import (
+    FIELDS, LIKERT_PREFIXES, canonical_header, canonicalize, field_columns, normalize_header,
+    resolve_schema
+)
+from survey_stats import SurveyAggregates
+from survey_trajectory import trajectory_columns
+
+# ######################################################################
+# --- SURVEY DATA LOADING ---
+# The survey is downloaded and parsed once per process and shared by every
+# Streamlit session, instead of once per rerun in studentSurvey.py.
+
+SURVEY_URL = os.environ.get(
+    "SURVEY_URL",
+    'https://raw.githubusercontent.com/izzatimahrup/SV2025/refs/heads/main/arts_student_survey_output.csv'
+)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Snapshot shipped with the repo (or any local copy configured via SURVEY_SNAPSHOT).
+SNAPSHOT_PATH = os.environ.get(
+    "SURVEY_SNAPSHOT", os.path.join(BASE_DIR, 'arts_student_survey_output.csv')
+)
+# Where background revalidation stores newer remote copies (git-ignored).
+CACHE_DIR = os.environ.get("SURVEY_CACHE_DIR", os.path.join(BASE_DIR, '.survey_cache'))
+
+# Scores of earlier data versions, for the PLO metric deltas
+PLO_HISTORY_PATH = os.path.join(CACHE_DIR, 'plo_history.json')
+
+# How long (seconds) a downloaded copy is trusted before it is fetched again.
+CACHE_TTL = int(os.environ.get("SURVEY_CACHE_TTL", 600))
+FETCH_TIMEOUT = 10
+
+
+def content_hash(raw):
+    return hashlib.sha256(raw).hexdigest()
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def fetch_survey_bytes(url):
+    """Download the raw CSV bytes (cached per URL for CACHE_TTL seconds)."""
+    with urlopen(url, timeout=FETCH_TIMEOUT) as response:
+        return response.read()
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def file_version(path, mtime_ns, size):
+    """Hash a local file once per (mtime, size) state."""
+    with open(path, 'rb') as f:
+        return content_hash(f.read())
+
+
+# ----------------------------------------------------------------------
+# --- Data sources ---
+# Every source exposes `label`, `version()` and `read_bytes()`; the loader
+# only ever talks to that interface.
+
+class LocalFileSource:
+    """A CSV file on local disk."""
+
+    def __init__(self, path):
+        self.path = path
+        self.label = f"local snapshot ({os.path.basename(path)})"
+
+    def exists(self):
+        return os.path.isfile(self.path)
+
+    def version(self):
+        stat = os.stat(self.path)
+        return file_version(self.path, stat.st_mtime_ns, stat.st_size)
+
+    def read_bytes(self):
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+
+class RemoteSource:
+    """The CSV at a URL, downloaded through the TTL cache."""
+
+    def __init__(self, url):
+        self.url = url
+        self.label = "GitHub URL"
+
+    def version(self):
+        return content_hash(fetch_survey_bytes(self.url))
+
+    def read_bytes(self):
+        return fetch_survey_bytes(self.url)
+
+
+class OfflineFirstSource:
+    """Serve the newest local copy and revalidate the remote in the background.
+
+    The first paint never waits on the network unless no local copy exists at
+    all. Revalidation uses conditional requests (ETag / Last-Modified), and a
+    changed remote file is written to CACHE_DIR, which is picked up on the
+    next rerun because its content hash (the data version) changes. Of the
+    two local copies, the more recently modified one is served.
+    """
+
+    _lock = threading.Lock()
+    _last_check = {}
+
+    def __init__(self, url=SURVEY_URL, snapshot_path=SNAPSHOT_PATH, cache_dir=CACHE_DIR):
+        self.remote = RemoteSource(url)
+        self.snapshot = LocalFileSource(snapshot_path)
+        self.cache_dir = cache_dir
+        self.cached = LocalFileSource(os.path.join(cache_dir, os.path.basename(snapshot_path)))
+        self.cached.label = "local copy of the GitHub URL"
+        self.meta_path = self.cached.path + '.meta.json'
+
+    def _current(self):
+        # The newer of the downloaded copy and the snapshot, so a snapshot that
+        # was updated (git pull) or reconfigured after the last download wins
+        local = [source for source in (self.cached, self.snapshot) if source.exists()]
+        if local:
+            return max(local, key=lambda source: os.stat(source.path).st_mtime_ns)
+        return self.remote
+
+    @property
+    def label(self):
+        return self._current().label
+
+    def version(self):
+        current = self._current()
+        if current is not self.remote:
+            self.revalidate_in_background()
+        return current.version()
+
+    def read_bytes(self):
+        return self._current().read_bytes()
+
+    def revalidate_in_background(self):
+        """Start at most one revalidation per CACHE_TTL seconds per URL."""
+        with self._lock:
+            now = time.monotonic()
+            last = self._last_check.get(self.remote.url)
+            if last is not None and now - last < CACHE_TTL:
+                return
+            self._last_check[self.remote.url] = now
+        threading.Thread(target=self.revalidate, daemon=True).start()
+
+    def revalidate(self):
+        """Conditionally re-download the remote CSV; return True if it changed."""
+        meta = {}
+        if os.path.isfile(self.meta_path):
+            with open(self.meta_path) as f:
+                meta = json.load(f)
+
+        request = Request(self.remote.url)
+        if meta.get('etag'):
+            request.add_header('If-None-Match', meta['etag'])
+        if meta.get('last_modified'):
+            request.add_header('If-Modified-Since', meta['last_modified'])
+
+        try:
+            with urlopen(request, timeout=FETCH_TIMEOUT) as response:
+                raw = response.read()
+                headers = response.headers
+        except HTTPError:
+            return False  # 304 Not Modified (or a server error): nothing new
+        except OSError:
+            return False  # Offline: keep serving the local copy
+
+        local = self._current()
+        if local is not self.remote and content_hash(raw) == local.version():
+            changed = False
+        else:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self.cached.path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(raw)
+            os.replace(tmp_path, self.cached.path)
+            changed = True
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self.meta_path, 'w') as f:
+            json.dump({
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+            }, f)
+        return changed
+
+
+def default_source():
+    return OfflineFirstSource()
+
+
+# ----------------------------------------------------------------------
+# --- Typed schema ---
+# Applied once at ingest so the Parquet snapshot already stores compact,
+# typed columns and the page no longer re-coerces text on every run.
+
+# Headers are canonical here: canonicalize() runs first (see survey_schema.py)
+GPA_COLUMNS = [FIELDS['ssc_gpa'], FIELDS['hsc_gpa']]
+CATEGORICAL_COLUMNS = [
+    FIELDS[field] for field in (
+        'gender', 'faculty', 'program', 'bachelor_year', 'masters_year', 'study_medium', 'coaching', 'class_format'
+    )
+]
+
+
+def apply_schema(df):
+    """Cast GPAs to float32, Likert answers to Int8 and labels to category."""
+    df = df.copy()
+    semesters = set(resolve_schema(df.columns).semesters)
+    for col in df.columns:
+        if col in GPA_COLUMNS or col in semesters:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float32')
+        elif normalize_header(col).startswith(LIKERT_PREFIXES):
+            df[col] = pd.to_numeric(df[col], errors='coerce').round().astype('Int8')
+        elif col in CATEGORICAL_COLUMNS:
+            df[col] = df[col].astype('category')
+    return df
+
+
+CATEGORY_MAX_RATIO = 0.5  # strings with fewer distinct values than this share become categories
+
+
+def compact_dtypes(df):
+    """Downcast every column apply_schema() left at a wide default dtype.
+
+    Low-cardinality strings become categories, integral float columns that
+    fit in int8 (Likert-style answers, flags) become nullable Int8, and any
+    remaining float64 columns become float32.
+    """
+    df = df.copy()
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_float_dtype(series) and series.dtype == 'float64':
+            values = series.dropna()
+            if (values == values.round()).all() and values.between(-128, 127).all():
+                df[col] = series.astype('Int8')
+            else:
+                df[col] = series.astype('float32')
+        elif pd.api.types.is_integer_dtype(series) and not isinstance(series.dtype, pd.CategoricalDtype):
+            df[col] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_string_dtype(series) or series.dtype == object:
+            if series.nunique() <= max(1, len(series) * CATEGORY_MAX_RATIO):
+                df[col] = series.astype('category')
+    return df
+
+
+def memory_footprint(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+# ----------------------------------------------------------------------
+# --- Column manifest ---
+# Which raw columns each section of studentSurvey.py reads. The page loads
+# only the union for the sections it shows, so the ~60 Likert and free-text
+# columns stay on disk.
+
+def likert_columns(header):
+    """Every 1–5 Likert item (the "Area of Evaluation", "Item" and Q1–Q6 columns)."""
+    return resolve_schema(header).likert
+
+
+def semester_columns(header):
+    """The twelve semester GPAs, averaged into Overall_Average_GPA."""
+    return resolve_schema(header).semesters
+
+
+# Entries are column names, or functions that pick names from the header
+SECTION_COLUMNS = {
+    'gender': [field_columns('gender')],
+    'program': [field_columns('program')],
+    'program_by_gender': [field_columns('program', 'gender')],
+    'gpa_comparison': [field_columns('ssc_gpa', 'hsc_gpa'), semester_columns],
+    'coaching': [field_columns('coaching'), semester_columns],
+    'academic_year': [field_columns('program', 'bachelor_year', 'masters_year')],
+    'plo': [plo_columns],
+    'likert': [likert_columns],
+    'group_tests': [
+        field_columns('gender', 'program', 'study_medium', 'regular', 'coaching', 'ssc_gpa', 'hsc_gpa'),
+        semester_columns,
+        likert_columns,
+    ],
+    'trajectory': [trajectory_columns],
+    'filters': [field_columns('gender', 'program', 'bachelor_year', 'masters_year', 'study_medium')],
+}
+
+
+def columns_for(sections, header):
+    """Union of the manifest columns for `sections` present in `header`."""
+    columns = []
+    for section in sections:
+        for entry in SECTION_COLUMNS[section]:
+            names = entry(header) if callable(entry) else [entry]
+            for col in names:
+                if col in header and col not in columns:
+                    columns.append(col)
+    return columns
+
+
+# ----------------------------------------------------------------------
+# --- Columnar snapshot ---
+# Parquet needs pyarrow; without it the loader keeps working from the CSV.
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+
+# Bumped when apply_schema() / compact_dtypes() change, so older snapshots are not reused
+INGEST_FORMAT = 2
+
+
+def parquet_path(data_version, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, f"survey-{data_version[:16]}-v{INGEST_FORMAT}.parquet")
+
+
+def ingest_survey(data_version, source, cache_dir=CACHE_DIR):
+    """Parse the CSV, compact its dtypes and write the Parquet snapshot.
+
+    The before/after memory footprint is saved next to the snapshot (see
+    memory_report()).
+    """
+    raw_df = canonicalize(pd.read_csv(io.BytesIO(source.read_bytes())))
+    df = compact_dtypes(apply_schema(raw_df))
+    if HAS_PARQUET:
+        os.makedirs(cache_dir, exist_ok=True)
+        path = parquet_path(data_version, cache_dir)
+        tmp_path = path + '.tmp'
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        with open(path + '.json', 'w') as f:
+            json.dump({
+                'rows': len(df),
+                'bytes_before': memory_footprint(raw_df),
+                'bytes_after': memory_footprint(df),
+            }, f)
+    return df
+
+
+def memory_report(data_version, cache_dir=CACHE_DIR):
+    """The footprint recorded at ingest, or None if there is no snapshot."""
+    path = parquet_path(data_version, cache_dir) + '.json'
+    if not os.path.isfile(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+# ----------------------------------------------------------------------
+# --- Derived metrics ---
+# Row-wise transformations the page needs, materialized once per data version
+# and column set instead of on every rerun.
+
+COACHING_COLUMN = FIELDS['coaching']
+NORMALIZED_GPA_COLUMNS = {FIELDS['ssc_gpa']: FIELDS['ssc_gpa_norm'], FIELDS['hsc_gpa']: FIELDS['hsc_gpa_norm']}
+
+
+def derive_metrics(df):
+    """Add Overall_Average_GPA, the 4.0-scale S.S.C/H.S.C GPAs and clean coaching answers."""
+    df = df.copy()
+
+    # 1. GPA Calculations
+    gpa_cols = semester_columns(df.columns)
+    if gpa_cols:
+        df[FIELDS['overall_gpa']] = df[gpa_cols].mean(axis=1, skipna=True)
+
+    # 2. Normalize SSC (5.0 scale) and HSC (5.0 scale) to 4.0 scale
+    for col, norm_col in NORMALIZED_GPA_COLUMNS.items():
+        if col in df.columns:
+            df[norm_col] = (df[col] / 5.0) * 4.0
+
+    # 3. Clean Coaching Center column
+    if COACHING_COLUMN in df.columns:
+        df[COACHING_COLUMN] = df[COACHING_COLUMN].astype(str).str.strip().str.title().astype('category')
+
+    # 4. Degree level, program duration and the cohort's academic year
+    return derive_cohorts(df)
+
+
+# ----------------------------------------------------------------------
+# --- Degree cohorts ---
+# Bachelor and Masters students answer different academic-year questions.
+# Each student's degree level comes from their program name ("B.A. ...",
+# "M. A. ..."), falling back to whichever academic-year question they
+# answered; 'Academic Year' then holds the answer for their own level, so
+# one column (and one cube dimension) serves both cohorts.
+
+DEGREE_LEVELS = ['Bachelor', 'Masters']
+DEGREE_PATTERNS = {
+    'Bachelor': re.compile(r'^b\.?\s*a\b'),
+    'Masters': re.compile(r'^m\.?\s*a\b'),
+}
+DURATION_PATTERN = re.compile(r'\(\s*(\d+(?:\.\d+)?)\s*years?\s*\)')
+DEFAULT_DURATIONS = {'Bachelor': 4.0}  # the twelve semester columns span four years
+COHORT_YEARS = {'Bachelor': ['1st Year', '2nd Year', '3rd Year', '4th Year'], 'Masters': ['1st Year', '2nd Year']}
+
+
+def program_degree(program):
+    name = normalize_header(program)
+    for level, pattern in DEGREE_PATTERNS.items():
+        if pattern.match(name):
+            return level
+    return None
+
+
+def program_duration(program, level):
+    """Years stated in the program name ("(1.4 Year)", "(2Year)"), else the level's default."""
+    match = DURATION_PATTERN.search(normalize_header(program))
+    return float(match.group(1)) if match else DEFAULT_DURATIONS.get(level, np.nan)
+
+
+def derive_cohorts(df):
+    """Add the degree level, program duration and cohort academic year columns.
+
+    Programs are resolved once per distinct name, not once per student.
+    """
+    program_col, bachelor_col, masters_col = FIELDS['program'], FIELDS['bachelor_year'], FIELDS['masters_year']
+    if not any(col in df.columns for col in (program_col, bachelor_col, masters_col)):
+        return df
+
+    def text_column(col):
+        if col in df.columns:
+            return df[col].astype(object)
+        return pd.Series(None, index=df.index, dtype=object)
+
+    programs, bachelor_year, masters_year = map(text_column, (program_col, bachelor_col, masters_col))
+    levels = {program: program_degree(program) for program in programs.dropna().unique()}
+    level = programs.map(levels)
+    answered = np.where(bachelor_year.notna(), 'Bachelor', np.where(masters_year.notna(), 'Masters', None))
+    level = level.where(level.notna(), pd.Series(answered, index=df.index))
+
+    df[FIELDS['degree_level']] = pd.Categorical(level, categories=DEGREE_LEVELS)
+    durations = {program: program_duration(program, levels[program]) for program in levels}
+    # A handful of distinct durations: a category, so it is filtered and rolled up like the level
+    df[FIELDS['program_duration']] = programs.map(durations).astype('category')
+    df[FIELDS['academic_year']] = masters_year.where(level == 'Masters', bachelor_year).astype('category')
+    return df
+
+
+# ----------------------------------------------------------------------
+# --- Loader ---
+
+def ensure_snapshot(data_version, source):
+    """Make sure the Parquet snapshot for `data_version` exists (if possible)."""
+    if HAS_PARQUET and not os.path.isfile(parquet_path(data_version)):
+        ingest_survey(data_version, source)
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def survey_header(data_version, _source):
+    """Column names of one data version, without loading any rows."""
+    if HAS_PARQUET and os.path.isfile(parquet_path(data_version)):
+        return list(pyarrow.parquet.read_schema(parquet_path(data_version)).names)
+    return [canonical_header(col) for col in pd.read_csv(io.BytesIO(_source.read_bytes()), nrows=0).columns]
+
+
+def read_survey(data_version, columns, source):
+    """Load one data version, reading only `columns` (None = all of them).
+
+    Not cached: the SurveyStore below keeps the one in-memory copy.
+    """
+    ensure_snapshot(data_version, source)
+    if HAS_PARQUET:
+        return pd.read_parquet(parquet_path(data_version), columns=list(columns) if columns else None)
+
+    wanted = set(columns) if columns else None
+    df = pd.read_csv(
+        io.BytesIO(source.read_bytes()),
+        usecols=(lambda col: canonical_header(col) in wanted) if wanted else None
+    )
+    return compact_dtypes(apply_schema(canonicalize(df)))
+
+
+# ----------------------------------------------------------------------
+# --- Incremental ingest ---
+# The survey CSV is append-only. When a new data version starts with the
+# exact bytes of the one already loaded, only the appended rows are parsed,
+# derived and folded into the running aggregates.
+
+TIMESTAMP_COLUMN = FIELDS['timestamp']
+TIMESTAMP_FORMAT = '%m/%d/%Y %H:%M'
+
+
+def parse_timestamps(values):
+    return pd.to_datetime(values, format=TIMESTAMP_FORMAT, errors='coerce')
+
+
+def align_dtypes(new_rows, frame):
+    """Return (frame, new_rows) cast to common dtypes so they concatenate cleanly.
+
+    Categories seen only in `new_rows` are added to a shallow copy of `frame`,
+    leaving the frame other sessions may be reading untouched.
+    """
+    frame = frame.copy(deep=False)
+    new_rows = new_rows.copy()
+    for col in frame.columns:
+        if col not in new_rows.columns:
+            new_rows[col] = pd.Series(pd.NA, index=new_rows.index).astype(frame[col].dtype)
+        elif isinstance(frame[col].dtype, pd.CategoricalDtype):
+            categories = frame[col].cat.categories
+            extra = pd.Index(new_rows[col].dropna().astype(str).unique()).difference(categories)
+            frame[col] = frame[col].cat.add_categories(extra)
+            new_rows[col] = pd.Categorical(new_rows[col].astype(object), categories=frame[col].cat.categories)
+        else:
+            new_rows[col] = new_rows[col].astype(frame[col].dtype)
+    return frame, new_rows[frame.columns]
+
+
+class SurveySnapshot:
+    """One consistent state of a SurveyStore: the derived frame, its data
+    version and its aggregates. Published as a whole and never modified, so
+    a session keeps rendering one version while the store moves on."""
+
+    def __init__(self, frame, data_version, aggregates):
+        self.frame = frame
+        self.data_version = data_version
+        self.aggregates = aggregates
+
+
+class SurveyStore:
+    """Process-wide derived survey frame and aggregates.
+
+    `update()` brings the store to the source's current data version, with
+    at least the given columns loaded, and returns its SurveySnapshot. A
+    version that only appends rows after the Timestamp watermark is applied
+    incrementally (a new frame and new aggregates from the previous ones
+    plus the new rows); anything else (edited or reordered rows) is a full
+    reload. Columns are only ever added: a section that needs more columns
+    gets them joined onto the same rows, so every session and section shares
+    one copy of the survey. The inputs of derive_metrics() and of the
+    aggregates are always loaded (store_columns()), so joining columns never
+    changes the derived ones. The frame is shared between sessions and must
+    be treated as read-only.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.snapshot = None
+        self.columns = []
+        self.size = 0
+        self.watermark = None
+
+    def update(self, source, columns):
+        with self.lock:
+            version = source.version()
+            wanted = store_columns(survey_header(version, source), columns)
+            if self.snapshot is None or version != self.snapshot.data_version:
+                raw = source.read_bytes()
+                current = [col for col in self.columns if col in wanted]
+                added = [col for col in wanted if col not in current]
+                self.columns = current + added
+                if added or not self._append(raw, version):
+                    self._reload(raw, version, source)
+            else:
+                added = [col for col in wanted if col not in self.columns]
+                if added:
+                    self._join(added, source)
+            return self.snapshot
+
+    def _reload(self, raw, version, source):
+        frame = derive_metrics(read_survey(version, self.columns, source))
+        self.watermark = None
+        timestamps = parse_timestamps(frame[TIMESTAMP_COLUMN]) if TIMESTAMP_COLUMN in frame.columns else None
+        self._commit(raw, SurveySnapshot(frame, version, SurveyAggregates().add(frame)), timestamps)
+
+    def _join(self, columns, source):
+        """Add `columns` of the loaded data version to the frame; the aggregates are kept."""
+        snapshot = self.snapshot
+        extra = read_survey(snapshot.data_version, columns, source)
+        frame = pd.concat([snapshot.frame, extra], axis=1)
+        self.columns = self.columns + list(columns)
+        self.snapshot = SurveySnapshot(frame, snapshot.data_version, snapshot.aggregates)
+
+    def _append(self, raw, version):
+        """Apply only the rows appended since the loaded version, if possible.
+
+        Without a Timestamp column appends cannot be told from edits, so such
+        surveys are always reloaded in full.
+        """
+        if self.snapshot is None or len(raw) <= self.size:
+            return False
+        if TIMESTAMP_COLUMN not in self.snapshot.frame.columns:
+            return False
+        if raw[self.size - 1:self.size] != b'\n' or content_hash(raw[:self.size]) != self.snapshot.data_version:
+            return False
+
+        header = raw[:raw.index(b'\n') + 1]
+        wanted = set(self.columns)
+        new_rows = canonicalize(pd.read_csv(
+            io.BytesIO(header + raw[self.size:]), usecols=lambda col: canonical_header(col) in wanted
+        ))
+        timestamps = parse_timestamps(new_rows[TIMESTAMP_COLUMN])
+        if self.watermark is not None and (timestamps < self.watermark).any():
+            return False  # Not append-only after all
+
+        new_rows = derive_metrics(compact_dtypes(apply_schema(new_rows)))
+        try:
+            frame, new_rows = align_dtypes(new_rows, self.snapshot.frame)
+        except (TypeError, ValueError):
+            return False
+        frame = pd.concat([frame, new_rows], ignore_index=True)
+        aggregates = self.snapshot.aggregates.merged(new_rows)
+        self._commit(raw, SurveySnapshot(frame, version, aggregates), timestamps)
+        return True
+
+    def _commit(self, raw, snapshot, timestamps=None):
+        self.snapshot = snapshot
+        self.size = len(raw)
+        if timestamps is None:
+            return
+        latest = timestamps.max()
+        if not pd.isna(latest):
+            self.watermark = latest if self.watermark is None else max(self.watermark, latest)
+
+
+# Fields read by derive_metrics() or kept as SurveyCube dimensions
+AGGREGATE_FIELDS = (
+    'gender', 'program', 'bachelor_year', 'masters_year', 'study_medium', 'ssc_gpa', 'hsc_gpa', 'coaching'
+)
+
+
+def store_columns(header, columns):
+    """`columns` plus the Timestamp and AGGREGATE_FIELDS / semester columns of `header`."""
+    schema = resolve_schema(header)
+    required = schema.present('timestamp', *AGGREGATE_FIELDS) + schema.semesters
+    wanted = []
+    for col in list(columns) + required:
+        if col in header and col not in wanted:
+            wanted.append(col)
+    return wanted
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def survey_store():
+    """The one SurveyStore of the process."""
+    return SurveyStore()
+
+
+def load_survey_store(source=None, sections=None):
+    """Return the current SurveySnapshot of the store, with the columns of `sections` loaded.
+
+    The data version is the SHA-256 of the CSV content, so any source that
+    yields identical bytes reuses the already ingested Parquet snapshot.
+    """
+    if source is None:
+        source = default_source()
+    header = survey_header(source.version(), source)
+    columns = columns_for(sections, header) if sections is not None else list(header)
+    return survey_store().update(source, columns)
+
+
+def clear_survey_cache():
+    """Drop every cached download and parsed frame (explicit invalidation)."""
+    fetch_survey_bytes.clear()
+    file_version.clear()
+    survey_header.clear()
+    survey_store.clear()
+    OfflineFirstSource._last_check.clear()
+
+
+if __name__ == "__main__":
+    # Ingest step: python survey_data.py
+    source = default_source()
+    version = source.version()
+    df = ingest_survey(version, source)
+    if HAS_PARQUET:
+        print(f"Wrote {parquet_path(version)} ({len(df)} rows, {df.shape[1]} columns)")
+        report = memory_report(version)
+        print(f"Memory: {report['bytes_before'] / 1e6:.2f} MB -> {report['bytes_after'] / 1e6:.2f} MB")
+    else:
+        print("pyarrow is not installed; the survey will be read from CSV.")
@@ -0,0 +1,122 @@
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from survey_schema import FIELDS
+
+# ######################################################################
+# --- COHORT FILTERS ---
+# One packed bitmap (1 bit per student) per value of every filter column,
+# built once per data version. A filter selection is answered by OR-ing the
+# bitmaps of the chosen values within a column and AND-ing across columns,
+# so slicing never rescans the categorical columns themselves.
+
+# Filter column -> label shown in the filter bar
+FILTER_COLUMNS = {
+    FIELDS['gender']: 'Gender',
+    FIELDS['program']: 'Arts Program',
+    FIELDS['degree_level']: 'Degree',
+    FIELDS['program_duration']: 'Duration (Years)',
+    FIELDS['academic_year']: 'Academic Year',
+    FIELDS['study_medium']: 'Study Medium',
+}
+
+
+class CohortIndex:
+    """Packed boolean bitmaps per (column, value)."""
+
+    def __init__(self, df, columns=FILTER_COLUMNS):
+        self.n_rows = len(df)
+        self.bitmaps = {}
+        for col in columns:
+            if col not in df.columns:
+                continue
+            codes, values = pd.factorize(df[col].astype(object), sort=True)  # NaN -> -1
+            self.bitmaps[col] = {
+                value: np.packbits(codes == code) for code, value in enumerate(values)
+            }
+
+    def values(self, col):
+        return list(self.bitmaps.get(col, {}))
+
+    def select(self, filters):
+        """Row positions matching `filters` ({column: [values]}), or None if nothing is filtered."""
+        result = None
+        for col, values in filters.items():
+            if not values or col not in self.bitmaps:
+                continue
+            selected = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+            for value in values:
+                bitmap = self.bitmaps[col].get(value)
+                if bitmap is not None:
+                    selected |= bitmap
+            result = selected if result is None else result & selected
+        if result is None:
+            return None
+        return np.flatnonzero(np.unpackbits(result, count=self.n_rows))
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def cohort_index(data_version, _df):
+    """The CohortIndex of one data version (shared by every session)."""
+    return CohortIndex(_df)
+
+
+def filtered_version(data_version, filters):
+    """A version string for a filtered view, usable as a cache key like a data version."""
+    active = {col: sorted(map(str, values)) for col, values in filters.items() if values}
+    if not active:
+        return data_version
+    digest = hashlib.sha256(json.dumps(active, sort_keys=True).encode()).hexdigest()[:16]
+    return f"{data_version}:{digest}"
+
+
+
+class SurveyView:
+    """The rows, aggregates and cache version of the students matching some filters.
+
+    Views are narrowed with filter(): rows are selected through the
+    CohortIndex of the full frame and the aggregates are sliced from the
+    cube, so switching a chart between cohorts never rescans the frame.
+    The rows themselves are only materialized when `df` is first read.
+    """
+
+    def __init__(self, frame, index, aggregates, version, positions=None):
+        self.frame = frame
+        self.index = index
+        self.aggregates = aggregates
+        self.version = version
+        self.positions = positions
+        self._df = None
+
+    @property
+    def df(self):
+        if self._df is None:
+            self._df = self.frame if self.positions is None else self.frame.iloc[self.positions].reset_index(drop=True)
+        return self._df
+
+    @property
+    def filtered(self):
+        return self.positions is not None
+
+    @property
+    def row_numbers(self):
+        """1-based survey row of each student in the view; stable under any filter."""
+        if self.positions is None:
+            return np.arange(1, len(self.frame) + 1)
+        return np.asarray(self.positions) + 1
+
+    def filter(self, filters):
+        """This view narrowed to the students matching `filters` as well."""
+        positions = self.index.select(filters)
+        if positions is None:
+            return self
+        if self.positions is not None:
+            positions = np.intersect1d(self.positions, positions, assume_unique=True)
+        return SurveyView(
+            self.frame, self.index, self.aggregates.filtered(filters),
+            filtered_version(self.version, filters), positions
+        )
@@ -0,0 +1,182 @@
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from scipy import stats
+
+from survey_data import COACHING_COLUMN, likert_columns, semester_columns
+from survey_schema import FIELDS
+from survey_stats import bootstrap_mean_diff, permutation_mean_diff
+
+# ######################################################################
+# --- BATCH HYPOTHESIS TESTS ---
+# Welch t-tests and Mann–Whitney U tests of every factor level against the
+# rest of the cohort, for every numeric metric at once. Each factor costs
+# one masked moment computation and one ranking of the metric matrix; each
+# of its levels is then a handful of column sums. p-values are corrected
+# with Benjamini–Hochberg across all tests of the same kind.
+
+FACTOR_COLUMNS = [FIELDS[field] for field in ('gender', 'program', 'study_medium', 'regular', 'coaching')]
+GPA_METRICS = [FIELDS[field] for field in ('ssc_gpa_norm', 'hsc_gpa_norm', 'overall_gpa')]
+MIN_GROUP_SIZE = 2
+
+
+def metric_columns(header):
+    """GPA metrics, semester GPAs and every Likert item present in `header`."""
+    columns = []
+    for col in GPA_METRICS + semester_columns(header) + likert_columns(header):
+        if col in header and col not in columns:
+            columns.append(col)
+    return columns
+
+
+def benjamini_hochberg(p_values):
+    """Benjamini–Hochberg adjusted p-values (q-values); NaN stays NaN."""
+    p_values = np.asarray(p_values, dtype=float)
+    q_values = np.full(p_values.shape, np.nan)
+    valid = ~np.isnan(p_values)
+    p = p_values[valid]
+    if not len(p):
+        return q_values
+    order = np.argsort(p)
+    ranked = p[order] * len(p) / np.arange(1, len(p) + 1)
+    ranked = np.minimum.accumulate(ranked[::-1])[::-1]
+    adjusted = np.empty_like(p)
+    adjusted[order] = np.minimum(ranked, 1.0)
+    q_values[valid] = adjusted
+    return q_values
+
+
+def masked_moments(values, mask):
+    """Per-column count, mean and sample variance of `values` rows in `mask`."""
+    selected = np.where(mask[:, None], values, np.nan)
+    count = (~np.isnan(selected)).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nansum(selected, axis=0) / count
+        variance = np.nansum(np.square(selected - mean), axis=0) / (count - 1)
+    return count, mean, variance
+
+
+def welch_batch(count_a, mean_a, var_a, count_b, mean_b, var_b):
+    """Vectorized Welch t-test over arrays of group summaries."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        se_a = var_a / count_a
+        se_b = var_b / count_b
+        t_stat = (mean_a - mean_b) / np.sqrt(se_a + se_b)
+        dof = (se_a + se_b) ** 2 / (se_a ** 2 / (count_a - 1) + se_b ** 2 / (count_b - 1))
+    return t_stat, 2 * stats.t.sf(np.abs(t_stat), dof)
+
+
+def tie_terms(ranked_values):
+    """Σ(t³ − t) over tied groups, per column (NaN ignored)."""
+    terms = np.zeros(ranked_values.shape[1])
+    for j in range(ranked_values.shape[1]):
+        column = ranked_values[:, j]
+        _, ties = np.unique(column[~np.isnan(column)], return_counts=True)
+        terms[j] = (ties ** 3 - ties).sum()
+    return terms
+
+
+def mannwhitney_batch(ranks, mask, count_a, count_b, ties):
+    """Vectorized two-sided Mann–Whitney U (normal approximation, continuity
+    and tie corrected, as scipy's method='asymptotic')."""
+    rank_sum = np.nansum(np.where(mask[:, None], ranks, np.nan), axis=0)
+    u_a = rank_sum - count_a * (count_a + 1) / 2
+    u = np.maximum(u_a, count_a * count_b - u_a)
+    n = count_a + count_b
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sigma = np.sqrt(count_a * count_b / 12 * ((n + 1) - ties / (n * (n - 1))))
+        z = (u - count_a * count_b / 2 - 0.5) / sigma
+    return u_a, np.clip(2 * stats.norm.sf(z), 0, 1)
+
+
+def batch_group_tests(df, factors=None, metrics=None, min_group_size=MIN_GROUP_SIZE):
+    """Test each level of each factor against the rest, for every metric.
+
+    Returns one row per (factor, level, metric) with group sizes and means,
+    Welch t / p, Mann–Whitney U / p and their Benjamini–Hochberg q-values.
+    Binary factors are tested once (first level vs. the other).
+    """
+    if factors is None:
+        factors = [col for col in FACTOR_COLUMNS if col in df.columns]
+    if metrics is None:
+        metrics = metric_columns(df.columns)
+
+    values = df[metrics].to_numpy(dtype=float, na_value=np.nan)
+    results = []
+    for factor in factors:
+        labels = df[factor].astype(object)
+        present = labels.notna().to_numpy()
+        levels = sorted(labels.dropna().unique(), key=str)
+        if len(levels) < 2:
+            continue
+
+        # Rank once per factor over the students that have a level
+        factor_values = np.where(present[:, None], values, np.nan)
+        ranks = stats.rankdata(factor_values, axis=0, nan_policy='omit')
+        ties = tie_terms(factor_values)
+
+        for level in (levels[:1] if len(levels) == 2 else levels):
+            in_group = (labels == level).to_numpy()
+            rest = present & ~in_group
+            count_a, mean_a, var_a = masked_moments(values, in_group)
+            count_b, mean_b, var_b = masked_moments(values, rest)
+            t_stat, t_p = welch_batch(count_a, mean_a, var_a, count_b, mean_b, var_b)
+            u_stat, u_p = mannwhitney_batch(ranks, in_group, count_a, count_b, ties)
+
+            too_small = (count_a < min_group_size) | (count_b < min_group_size)
+            t_p[too_small] = np.nan
+            u_p[too_small] = np.nan
+            results.append(pd.DataFrame({
+                'Factor': factor,
+                'Group': str(level),
+                'Metric': metrics,
+                'n (group)': count_a,
+                'n (rest)': count_b,
+                'Mean (group)': mean_a,
+                'Mean (rest)': mean_b,
+                'Welch t': t_stat,
+                'Welch p': t_p,
+                'Mann-Whitney U': u_stat,
+                'Mann-Whitney p': u_p,
+            }))
+
+    if not results:
+        return pd.DataFrame()
+    tests = pd.concat(results, ignore_index=True)
+    tests['Welch q'] = benjamini_hochberg(tests['Welch p'])
+    tests['Mann-Whitney q'] = benjamini_hochberg(tests['Mann-Whitney p'])
+    return tests
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def cached_batch_group_tests(data_version, _df):
+    """batch_group_tests() computed once per data version."""
+    return batch_group_tests(_df)
+
+
+# ----------------------------------------------------------------------
+# --- Coaching resampling tests ---
+
+RESAMPLE_SEED = 2025
+# Worker processes for the resampling (1 = run in the Streamlit process)
+RESAMPLE_WORKERS = int(os.environ.get("RESAMPLE_WORKERS", 1))
+
+
+@st.cache_data(max_entries=16, show_spinner="Resampling...")
+def cached_coaching_resampling(data_version, n_resamples, _df, metric=FIELDS['overall_gpa']):
+    """Bootstrap CI and permutation p-value for the coaching Yes − No GPA gap.
+
+    Cached per data version and resample count; the fixed seed makes every
+    cache miss reproduce the same numbers.
+    """
+    yes_values = _df.loc[_df[COACHING_COLUMN] == 'Yes', metric]
+    no_values = _df.loc[_df[COACHING_COLUMN] == 'No', metric]
+    diff, low, high = bootstrap_mean_diff(
+        yes_values, no_values, n_resamples, seed=RESAMPLE_SEED, workers=RESAMPLE_WORKERS
+    )
+    _, p_value = permutation_mean_diff(
+        yes_values, no_values, n_resamples, seed=RESAMPLE_SEED, workers=RESAMPLE_WORKERS
+    )
+    return {'diff': diff, 'ci_low': low, 'ci_high': high, 'p_value': p_value}
@@ -0,0 +1,126 @@
+import re
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from survey_data import likert_columns
+
+# ######################################################################
+# --- LIKERT ITEM ANALYTICS ---
+# Distribution, mean, top-2-box and response count of every Likert item,
+# computed together from one int8 answer matrix.
+
+LIKERT_LEVELS = [1, 2, 3, 4, 5]
+LIKERT_LABELS = {
+    1: 'Strongly disagree',
+    2: 'Disagree',
+    3: 'Neutral',
+    4: 'Agree',
+    5: 'Strongly agree',
+}
+LIKERT_COLORS = {1: '#c0392b', 2: '#f1948a', 3: '#d5d8dc', 4: '#85c1e9', 5: '#2471a3'}
+
+
+def item_label(col):
+    """'Item [\\tClass size is optimum ...]' -> 'Class size is optimum ...'"""
+    match = re.match(r'^(?:Area of Evaluation|Item|Q\d+)\s*\[(.*)\]\s*$', col, flags=re.S)
+    text = match.group(1) if match else col
+    return ' '.join(text.replace('\x92', "'").split())
+
+
+def likert_summary(df, columns=None):
+    """One row per item: response count, mean, top-2-box share and % per level.
+
+    All items are counted with a single np.bincount over (item, answer) codes,
+    so the cost is one pass over the (students × items) int8 matrix.
+    """
+    if columns is None:
+        columns = likert_columns(df.columns)
+    n_levels = len(LIKERT_LEVELS) + 1  # code 0 = missing / out of range
+
+    answers = df[columns].to_numpy(dtype=np.float32, na_value=np.nan)
+    codes = np.nan_to_num(answers, nan=0).astype(np.int8)
+    codes[(codes < 1) | (codes > 5)] = 0
+
+    item_offsets = np.arange(len(columns), dtype=np.int64) * n_levels
+    counts = np.bincount(
+        (codes.astype(np.int64) + item_offsets).ravel(), minlength=len(columns) * n_levels
+    ).reshape(len(columns), n_levels)[:, 1:]
+
+    responses = counts.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        shares = counts / responses[:, None]
+        means = (counts * np.array(LIKERT_LEVELS)).sum(axis=1) / responses
+
+    summary = pd.DataFrame({
+        'Item': [item_label(col) for col in columns],
+        'Column': columns,
+        'Responses': responses,
+        'Mean': means,
+        'Top 2 Box': shares[:, 3] + shares[:, 4],
+    })
+    for i, level in enumerate(LIKERT_LEVELS):
+        summary[LIKERT_LABELS[level]] = shares[:, i]
+    return summary
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def cached_likert_summary(data_version, _df):
+    """likert_summary() computed once per data version."""
+    return likert_summary(_df)
+
+
+def likert_diverging_figure(summary):
+    """Diverging stacked bars: disagreement left of zero, agreement right.
+
+    The neutral share is split across zero. The figure always has five
+    traces, one per answer level, however many items are shown.
+    """
+    summary = summary.sort_values('Mean')
+    neutral = summary[LIKERT_LABELS[3]] / 2
+    segments = {
+        1: -summary[LIKERT_LABELS[1]],
+        2: -summary[LIKERT_LABELS[2]],
+        3: None,
+        4: summary[LIKERT_LABELS[4]],
+        5: summary[LIKERT_LABELS[5]],
+    }
+
+    fig = go.Figure()
+    # Neutral first on both sides so it straddles the zero line
+    for level, base_sign in ((3, -1), (3, 1)):
+        fig.add_trace(go.Bar(
+            y=summary['Item'],
+            x=neutral * base_sign * 100,
+            orientation='h',
+            name=LIKERT_LABELS[level],
+            marker_color=LIKERT_COLORS[level],
+            legendgroup=LIKERT_LABELS[level],
+            showlegend=base_sign > 0,
+            customdata=summary[LIKERT_LABELS[level]] * 100,
+            hovertemplate='%{y}<br>' + LIKERT_LABELS[level] + ': %{customdata:.0f}%<extra></extra>'
+        ))
+    for level in (2, 1, 4, 5):
+        fig.add_trace(go.Bar(
+            y=summary['Item'],
+            x=segments[level] * 100,
+            orientation='h',
+            name=LIKERT_LABELS[level],
+            marker_color=LIKERT_COLORS[level],
+            customdata=summary[LIKERT_LABELS[level]] * 100,
+            hovertemplate='%{y}<br>' + LIKERT_LABELS[level] + ': %{customdata:.0f}%<extra></extra>'
+        ))
+
+    fig.update_layout(
+        title='Survey Evaluation Items: Share of Responses (Diverging at Neutral)',
+        barmode='relative',
+        xaxis_title='% of responses (disagree ← → agree)',
+        yaxis_title=None,
+        height=max(400, 22 * len(summary) + 150),
+        legend=dict(orientation='h', yanchor='bottom', y=1.02, traceorder='normal'),
+        margin=dict(l=0, r=0)
+    )
+    fig.update_xaxes(range=[-100, 100], ticksuffix='%')
+    return fig
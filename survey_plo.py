@@ -0,0 +1,138 @@
+import json
+import os
+
+import numpy as np
+import streamlit as st
+
+from survey_schema import normalize_header
+
+# ######################################################################
+# --- PLO SCORES ---
+# Each Programme Learning Outcome is scored as the average of the mean
+# Likert answer (1–5) of the survey items mapped to it below. Items are
+# matched by a phrase from their header, so tabs, trailing spaces and the
+# "Area of Evaluation [...]" / "Item [...]" wrappers do not matter.
+
+PLO_CONFIG = {
+    'PLO 2': {
+        'help': 'PLO 2: Cognitive Skill',
+        'items': [
+            'courses in the curriculum from lower level to higher are properly arranged',
+            'assessment system meets the objectives of the course',
+            'questions of examinations reflect the content of the course',
+            'diverse methods are used to achieve learning objectives',
+            'mechanism exists for engaging the students in research',
+            'research findings in the form of theses',
+        ],
+    },
+    'PLO 3': {
+        'help': 'PLO 3: Digital Skill',
+        'items': [
+            'modern devices are used to improve teaching-learning process',
+            'internet facilities with sufficient speed are available',
+            'website is informative and updated properly',
+            'laboratories facilities are suitable for practical teaching-learning',
+        ],
+    },
+    'PLO 4': {
+        'help': 'PLO 4: Interpersonal Skill',
+        'items': [
+            'teaching-learning is interactive and supportive',
+            'class size is optimum for interactive teaching learning',
+            'encouraged to involve in co- curricular and extra-curricular activities',
+            'opportunities to get involve with community services',
+            'alumni are organized and supportive',
+            'mentoring is done to take care of the students',
+        ],
+    },
+    'PLO 5': {
+        'help': 'PLO 5: Communication Skill',
+        'items': [
+            'student feedback process is in practice',
+            'opinion regarding academic and extra-academic matters are addressed',
+            'assessment feedback is provided to the students immediately',
+            'lesson plans/course outlines are provided in advance',
+            'all about assessment system are duly communicated',
+            'arrangement to provide guidance and counseling',
+        ],
+    },
+}
+
+HISTORY_LENGTH = 20
+
+
+def plo_item_columns(header, config=PLO_CONFIG):
+    """Map each PLO to the header columns of its items."""
+    normalized = [(col, normalize_header(col)) for col in header]
+    return {
+        plo: [col for col, name in normalized if any(phrase in name for phrase in spec['items'])]
+        for plo, spec in config.items()
+    }
+
+
+def plo_columns(header):
+    """Every column any PLO reads (a SECTION_COLUMNS selector)."""
+    columns = []
+    for cols in plo_item_columns(header).values():
+        columns += [col for col in cols if col not in columns]
+    return columns
+
+
+def plo_scores(df, config=PLO_CONFIG):
+    """Score every PLO with one vectorized pass over the Likert item matrix."""
+    item_columns = plo_item_columns(df.columns, config)
+    columns = plo_columns(df.columns)
+    if not columns:
+        return {plo: np.nan for plo in config}
+
+    matrix = df[columns].to_numpy(dtype=np.float32, na_value=np.nan)
+    counts = (~np.isnan(matrix)).sum(axis=0)
+    sums = np.nansum(matrix, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        item_means = dict(zip(columns, sums / counts))
+
+    scores = {}
+    for plo, cols in item_columns.items():
+        means = [item_means[col] for col in cols if not np.isnan(item_means[col])]
+        scores[plo] = float(np.mean(means)) if means else np.nan
+    return scores
+
+
+def record_scores(data_version, scores, history_path):
+    """Append this version's scores to the on-disk history; return the previous scores.
+
+    The history keeps the last HISTORY_LENGTH data versions in the order they
+    were first seen, so the "previous snapshot" survives restarts.
+    """
+    history = []
+    if os.path.isfile(history_path):
+        with open(history_path) as f:
+            history = json.load(f)
+
+    versions = [entry['data_version'] for entry in history]
+    if data_version in versions:
+        position = versions.index(data_version)
+        return history[position - 1]['scores'] if position > 0 else None
+
+    previous = history[-1]['scores'] if history else None
+    history.append({'data_version': data_version, 'scores': scores})
+    os.makedirs(os.path.dirname(history_path) or '.', exist_ok=True)
+    tmp_path = history_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(history[-HISTORY_LENGTH:], f)
+    os.replace(tmp_path, history_path)
+    return previous
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def plo_metrics(data_version, _df, history_path):
+    """{PLO: (score, delta vs. the previous data version or None)}, cached per data version."""
+    scores = plo_scores(_df)
+    stored = {plo: None if np.isnan(score) else score for plo, score in scores.items()}
+    previous = record_scores(data_version, stored, history_path)
+    metrics = {}
+    for plo, score in scores.items():
+        before = previous.get(plo) if previous else None
+        delta = score - before if before is not None and not np.isnan(score) else None
+        metrics[plo] = (score, delta)
+    return metrics
@@ -0,0 +1,222 @@
+import html
+import json
+import math
+import os
+import threading
+import time
+
+from plotly.offline import get_plotlyjs
+
+from survey_charts import (
+    academic_year_figure, coaching_gpa_figure, gender_bar_figure, gender_pie_figure,
+    gpa_trajectory_figure, program_gender_figure, program_pie_figure
+)
+from survey_data import COHORT_YEARS, default_source, likert_columns, load_survey_store
+from survey_likert import likert_diverging_figure, likert_summary
+from survey_plo import plo_scores
+from survey_schema import FIELDS
+from survey_static import STATIC_DIR, has_snapshot, latest_path, snapshot_dir
+from survey_stats import welch_ttest
+from survey_trajectory import semester_fan_figure, semester_matrix, semester_summary, trajectory_columns
+
+# ######################################################################
+# --- SNAPSHOT BUILD ---
+# Renders the sections of studentSurvey.py, unfiltered and for the 'All'
+# cohort, into the static artifacts served by survey_static.py. Run it after
+# ingest (python survey_data.py && python survey_prerender.py); the page
+# also starts a build in the background when it serves a data version that
+# has no snapshot yet (prerender_in_background()). Interactive parts
+# (filters, resampling, group tests, at-risk table) are left to the live
+# page.
+
+PAGE_TITLE = "Arts Faculty Data Analysis and Visualization 📊"
+
+# (SECTION_COLUMNS key, title, charts) in page order
+SNAPSHOT_SECTIONS = [
+    ('gender', "Gender Distribution", ['gender_bar', 'gender_pie']),
+    ('program_by_gender', "Arts Programs", ['program_pie', 'program_by_gender']),
+    ('gpa_comparison', "Normalized GPA Comparison: S.S.C → H.S.C → University", ['gpa_comparison']),
+    ('coaching', "Average Overall GPA: Coaching Center vs Non-Coaching Students", ['coaching_gpa']),
+    ('academic_year', "Distribution of Academic Years (Bachelor)", ['academic_year']),
+    ('likert', "Student Evaluation of the Program (Likert Items)", ['likert_items']),
+    ('trajectory', "Semester GPA Trajectory", ['semester_fan']),
+]
+SNAPSHOT_COLUMNS = [key for key, _, _ in SNAPSHOT_SECTIONS] + ['plo']
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<script src="../plotly.min.js"></script>
+<style>
+body {{ font-family: "Source Sans Pro", sans-serif; margin: 0 1rem; color: #31333f; }}
+.meta {{ color: #808495; font-size: 0.9rem; }}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+def chart_builders(df, aggregates):
+    """{chart name: builder} for every chart studentSurvey.py draws (unfiltered, 'All' cohort)."""
+    year_order = COHORT_YEARS['Bachelor']
+    builders = {
+        'gender_bar': lambda: gender_bar_figure(aggregates.value_counts(FIELDS['gender'])),
+        'gender_pie': lambda: gender_pie_figure(aggregates.value_counts(FIELDS['gender'])),
+        'program_pie': lambda: program_pie_figure(aggregates.value_counts(FIELDS['program'])),
+        'program_by_gender': lambda: program_gender_figure(aggregates.program_gender_long()),
+        'gpa_comparison': lambda: gpa_trajectory_figure(df, averages=aggregates.gpa_means()),
+        'coaching_gpa': lambda: coaching_gpa_figure(aggregates.coaching_means()),
+    }
+    if FIELDS['academic_year'] in df.columns:
+        def academic_year():
+            year_df = aggregates.filtered({FIELDS['degree_level']: ['Bachelor']}).value_counts(FIELDS['academic_year'])
+            year_df.columns = ['Academic Year', 'Count']
+            year_df = year_df[year_df['Academic Year'].isin(year_order)]
+            return academic_year_figure(year_df, year_order)
+        builders['academic_year'] = academic_year
+    if likert_columns(df.columns):
+        builders['likert_items'] = lambda: likert_diverging_figure(likert_summary(df))
+    if trajectory_columns(df.columns):
+        builders['semester_fan'] = lambda: semester_fan_figure(semester_summary(*semester_matrix(df)))
+    return builders
+
+
+def coaching_notes(aggregates):
+    """The Welch t-test lines of the coaching section."""
+    yes_group = aggregates.coaching_gpa.get('Yes')
+    no_group = aggregates.coaching_gpa.get('No')
+    if yes_group is None or no_group is None or yes_group.count < 2 or no_group.count < 2:
+        return []
+    t_stat, p_value = welch_ttest(yes_group, no_group)
+    return [
+        f"Average GPA (Coaching Yes): {yes_group.mean:.3f}; Average GPA (Coaching No): {no_group.mean:.3f}",
+        f"T-statistic = {t_stat:.3f}, P-value = {p_value:.4f}",
+    ]
+
+
+def snapshot_html(manifest, figures):
+    """One static page with every section, using the local plotly.min.js (see write_plotlyjs())."""
+    plo = ', '.join(f"{name} {score:.1f}" for name, score in manifest['plo'].items() if score is not None)
+    parts = [
+        f"<h2>{html.escape(PAGE_TITLE)}</h2>",
+        f"<p class=\"meta\">{manifest['rows']:,} students · {html.escape(plo)} · built {manifest['built']}</p>",
+    ]
+    for section in manifest['sections']:
+        parts.append(f"<h3>{html.escape(section['title'])}</h3>")
+        for name in section['charts']:
+            parts.append(figures[name].to_html(
+                full_html=False, include_plotlyjs=False, default_height='450px', config={'displayModeBar': False}
+            ))
+        parts += [f"<p>{html.escape(note)}</p>" for note in section['notes']]
+    return HTML_TEMPLATE.format(title=html.escape(PAGE_TITLE), body='\n'.join(parts))
+
+
+def write_atomic(path, text):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def write_plotlyjs(static_dir=STATIC_DIR):
+    """Copy the installed plotly.js next to the snapshots, once per version of it."""
+    path = os.path.join(static_dir, 'plotly.min.js')
+    script = get_plotlyjs()
+    if not os.path.isfile(path) or os.path.getsize(path) != len(script.encode()):
+        os.makedirs(static_dir, exist_ok=True)
+        write_atomic(path, script)
+
+
+def build_snapshot(data_version, df, aggregates, static_dir=STATIC_DIR):
+    """Write the snapshot of `data_version` and make it the latest; returns its manifest.
+
+    `df` and `aggregates` are the unfiltered derived survey and its
+    SurveyAggregates. Every file is replaced atomically and the manifest is
+    written last, so readers never see a half-built snapshot.
+    """
+    builders = chart_builders(df, aggregates)
+    figures = {name: build() for name, build in builders.items()}
+    notes = {'coaching': coaching_notes(aggregates)}
+    scores = plo_scores(df)
+
+    out_dir = snapshot_dir(data_version, static_dir)
+    os.makedirs(out_dir, exist_ok=True)
+    write_plotlyjs(static_dir)
+    for name, fig in figures.items():
+        write_atomic(os.path.join(out_dir, f'{name}.json'), fig.to_json())
+
+    manifest = {
+        'data_version': data_version,
+        'built': time.strftime('%Y-%m-%d %H:%M'),
+        'rows': len(df),
+        'plo': {plo: None if math.isnan(score) else round(score, 3) for plo, score in scores.items()},
+        'sections': [
+            {
+                'key': key,
+                'title': title,
+                'charts': [name for name in charts if name in figures],
+                'notes': notes.get(key, []),
+            }
+            for key, title, charts in SNAPSHOT_SECTIONS
+        ],
+    }
+    write_atomic(os.path.join(out_dir, 'index.html'), snapshot_html(manifest, figures))
+    write_atomic(os.path.join(out_dir, 'manifest.json'), json.dumps(manifest, indent=2))
+    write_atomic(latest_path(static_dir), json.dumps({'data_version': data_version}))
+    return manifest
+
+
+class SnapshotBuilder:
+    """At most one background snapshot build per data version per process."""
+
+    _lock = threading.Lock()
+    _building = set()
+
+    @classmethod
+    def start(cls, data_version, df, aggregates, static_dir=STATIC_DIR):
+        """Build `data_version`'s snapshot on a daemon thread unless it exists or is being built.
+
+        `df` and `aggregates` are only read, so a SurveySnapshot's can be
+        passed as is.
+        """
+        with cls._lock:
+            if data_version in cls._building or has_snapshot(data_version, static_dir):
+                return False
+            cls._building.add(data_version)
+
+        def run():
+            try:
+                build_snapshot(data_version, df, aggregates, static_dir)
+            except (OSError, ValueError, KeyError):
+                pass  # No snapshot for this version: the page still renders live
+            finally:
+                with cls._lock:
+                    cls._building.discard(data_version)
+
+        threading.Thread(target=run, daemon=True).start()
+        return True
+
+
+def prerender_in_background(source, static_dir=STATIC_DIR):
+    """Start building the snapshot of `source`'s current data version if it has none.
+
+    The page loads only its open tab's columns, so the snapshot's columns
+    (SNAPSHOT_COLUMNS) are loaded here, from the shared store.
+    """
+    if has_snapshot(source.version(), static_dir):
+        return False
+    survey = load_survey_store(source, sections=SNAPSHOT_COLUMNS)
+    return SnapshotBuilder.start(survey.data_version, survey.frame, survey.aggregates, static_dir)
+
+
+if __name__ == "__main__":
+    # Build step: python survey_prerender.py (after python survey_data.py)
+    survey = load_survey_store(default_source(), sections=SNAPSHOT_COLUMNS)
+    manifest = build_snapshot(survey.data_version, survey.frame, survey.aggregates)
+    charts = sum(len(section['charts']) for section in manifest['sections'])
+    print(f"Wrote {snapshot_dir(survey.data_version)} ({manifest['rows']} rows, {charts} charts)")
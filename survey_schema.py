@@ -0,0 +1,108 @@
+import functools
+import re
+
+# ######################################################################
+# --- SURVEY SCHEMA ---
+# Canonical fields of the survey and the header each one is stored under.
+# Source headers are matched after normalization (case, tabs, repeated or
+# trailing whitespace), so "Bachelor Academic Year in EU" and the real
+# "Bachelor  Academic Year in EU" resolve to the same field. The survey is
+# renamed to the canonical headers once at ingest (canonicalize()), and the
+# rest of the app looks columns up here instead of scanning the header.
+
+# Field ID -> canonical header
+FIELDS = {
+    'timestamp': 'Timestamp',
+    'gender': 'Gender',
+    'faculty': 'Faculty',
+    'program': 'Arts Program',
+    'bachelor_year': 'Bachelor  Academic Year in EU',
+    'masters_year': 'Masters Academic Year in EU',
+    'study_medium': 'H.S.C or Equivalent study medium',
+    'ssc_gpa': 'S.S.C (GPA)',
+    'hsc_gpa': 'H.S.C (GPA)',
+    'coaching': 'Did you ever attend a Coaching center?',
+    'regular': 'Regular/Irregular',
+    'class_format': 'Classes are mostly',
+    # Derived at ingest (survey_data.derive_metrics / derive_cohorts)
+    'ssc_gpa_norm': 'S.S.C (GPA)_norm',
+    'hsc_gpa_norm': 'H.S.C (GPA)_norm',
+    'overall_gpa': 'Overall_Average_GPA',
+    'degree_level': 'Degree Level',
+    'program_duration': 'Program Duration (Years)',
+    'academic_year': 'Academic Year',
+}
+
+SEMESTER_PATTERN = re.compile(r'^\s*(\d)(?:st|nd|rd|th) Year Semester (\d)\s*$', re.IGNORECASE)
+LIKERT_PREFIXES = ('area of evaluation [', 'item [', 'q1 [', 'q2 [', 'q3 [', 'q4 [', 'q5 [', 'q6 [')
+
+
+def normalize_header(col):
+    return ' '.join(col.lower().split())
+
+
+CANONICAL_HEADERS = {normalize_header(header): header for header in FIELDS.values()}
+
+
+def canonical_header(col):
+    """The canonical header for `col` if it is a known field, else `col` unchanged."""
+    return CANONICAL_HEADERS.get(normalize_header(col), col)
+
+
+def canonicalize(df):
+    """`df` with every known field renamed to its canonical header."""
+    return df.rename(columns=canonical_header)
+
+
+class SurveySchema:
+    """The header names of every canonical field and column group of one survey.
+
+    Field accessors are attributes named after the FIELDS IDs (None when the
+    survey lacks the field). Column groups:
+      * semesters – the twelve "Nth Year Semester M" GPAs, chronological;
+        Overall_Average_GPA is their mean;
+      * likert    – every 1–5 answer ("Area of Evaluation", "Item", Q1–Q6),
+        including "... commencement of the term/semester".
+    """
+
+    def __init__(self, header):
+        self.header = tuple(header)
+        by_name = {}
+        for col in self.header:
+            by_name.setdefault(normalize_header(col), col)
+        self.fields = {field: by_name.get(normalize_header(name)) for field, name in FIELDS.items()}
+        for field, col in self.fields.items():
+            setattr(self, field, col)
+
+        semesters = []
+        for col in self.header:
+            match = SEMESTER_PATTERN.match(normalize_header(col))
+            if match:
+                semesters.append(((int(match.group(1)), int(match.group(2))), col))
+        self.semesters = [col for _, col in sorted(semesters)]
+        self.likert = [col for col in self.header if normalize_header(col).startswith(LIKERT_PREFIXES)]
+
+    def column(self, field):
+        """Header of `field`, or None if the survey does not have it."""
+        if field not in FIELDS:
+            raise KeyError(f"Unknown survey field: {field!r}")
+        return self.fields[field]
+
+    def present(self, *fields):
+        """Headers of the `fields` the survey has, in order."""
+        return [col for col in map(self.column, fields) if col is not None]
+
+
+@functools.lru_cache(maxsize=16)
+def _resolve(header):
+    return SurveySchema(header)
+
+
+def resolve_schema(header):
+    """The SurveySchema of `header`, resolved once per distinct header."""
+    return _resolve(tuple(header))
+
+
+def field_columns(*fields):
+    """A SECTION_COLUMNS selector for canonical fields."""
+    return lambda header: resolve_schema(header).present(*fields)
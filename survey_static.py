@@ -0,0 +1,116 @@
+import json
+import os
+import sys
+
+import plotly.io as pio
+import streamlit as st
+
+# ######################################################################
+# --- STATIC SNAPSHOT ---
+# A pre-rendered copy of the dashboard for the first paint. The build step
+# (survey_prerender.py) writes, per data version, every section's figures as
+# Plotly JSON, a manifest and an index.html, and points latest.json at the
+# newest build:
+#
+#   .survey_cache/static/latest.json, plotly.min.js
+#   .survey_cache/static/<data version>-v<format>/manifest.json, index.html, <chart>.json
+#
+# studentSurvey.py draws the latest snapshot as soon as the script starts and
+# removes it once the open tab has rendered live. The charts are drawn from
+# their JSON with st.plotly_chart, i.e. with the plotly.js bundled in
+# Streamlit's frontend, so the snapshot needs no network. This module only
+# imports Streamlit and plotly.io (both cheap), so the snapshot is on screen
+# before pandas and SciPy are imported. index.html loads the plotly.min.js
+# next to it and can be served as is by any static file server.
+
+# Same directory as survey_data.CACHE_DIR, not imported from there (see above)
+STATIC_DIR = os.path.join(
+    os.environ.get("SURVEY_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), '.survey_cache')),
+    'static'
+)
+# Bumped when what the snapshot shows changes, so older builds are not served
+SNAPSHOT_FORMAT = 2
+SHOWN_KEY = '_static_snapshot_shown'
+
+# Once these are imported the process is warm and the live page renders about
+# as fast as the snapshot, which would then only flash
+LIVE_MODULES = ('pandas', 'scipy')
+
+
+def snapshot_dir(data_version, static_dir=STATIC_DIR):
+    return os.path.join(static_dir, f"{data_version[:16]}-v{SNAPSHOT_FORMAT}")
+
+
+def latest_path(static_dir=STATIC_DIR):
+    return os.path.join(static_dir, 'latest.json')
+
+
+def read_manifest(data_version, static_dir=STATIC_DIR):
+    """The manifest of `data_version`'s snapshot, or None if it has not been built."""
+    try:
+        with open(os.path.join(snapshot_dir(data_version, static_dir), 'manifest.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def has_snapshot(data_version, static_dir=STATIC_DIR):
+    # The manifest is written last, so its presence means the build finished
+    return os.path.isfile(os.path.join(snapshot_dir(data_version, static_dir), 'manifest.json'))
+
+
+def latest_snapshot(static_dir=STATIC_DIR):
+    """The manifest of the most recently built snapshot, or None."""
+    try:
+        with open(latest_path(static_dir)) as f:
+            data_version = json.load(f)['data_version']
+    except (OSError, ValueError, KeyError):
+        return None
+    return read_manifest(data_version, static_dir)
+
+
+def read_figure(data_version, name, static_dir=STATIC_DIR):
+    with open(os.path.join(snapshot_dir(data_version, static_dir), f'{name}.json')) as f:
+        return pio.from_json(f.read())
+
+
+def static_snapshot(static_dir=STATIC_DIR):
+    """Draw the latest snapshot on the first run of a session in a cold process.
+
+    Returns the placeholder holding it (call .empty() once the live page has
+    rendered), or None when there is no snapshot, this session already had
+    its first paint or the process is warm (LIVE_MODULES imported).
+    """
+    if st.session_state.get(SHOWN_KEY):
+        return None
+    st.session_state[SHOWN_KEY] = True
+    if all(module in sys.modules for module in LIVE_MODULES):
+        return None
+
+    manifest = latest_snapshot(static_dir)
+    if manifest is None:
+        return None
+    try:
+        figures = {
+            name: read_figure(manifest['data_version'], name, static_dir)
+            for section in manifest['sections'] for name in section['charts']
+        }
+    except (OSError, ValueError):
+        return None
+
+    placeholder = st.empty()
+    with placeholder.container():
+        plo = ', '.join(f"{name} {score:.1f}" for name, score in manifest['plo'].items() if score is not None)
+        st.caption(
+            f"Snapshot of {manifest['rows']:,} students built {manifest['built']} ({plo}). "
+            f"Loading the live dashboard…"
+        )
+        for section in manifest['sections']:
+            if not section['charts'] and not section['notes']:
+                continue
+            st.subheader(section['title'])
+            for name in section['charts']:
+                st.plotly_chart(figures[name], width='stretch', key=f'snapshot_{name}')
+            for note in section['notes']:
+                st.write(note)
+    return placeholder
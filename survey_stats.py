@@ -0,0 +1,322 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from survey_schema import FIELDS
+
+# ######################################################################
+# --- SURVEY AGGREGATES ---
+# Summaries the page displays, kept as additive statistics so newly ingested
+# rows can be folded in without rescanning the rows already counted.
+
+
+def merge_moments(count_a, mean_a, m2_a, count_b, mean_b, m2_b):
+    """Chan et al.'s pairwise update of (count, mean, M2); elementwise on arrays."""
+    count = count_a + count_b
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weight = np.where(count > 0, count_b / count, 0.0)
+    delta = mean_b - mean_a
+    return count, mean_a + delta * weight, m2_a + m2_b + delta * delta * count_a * weight
+
+
+class RunningMoments:
+    """Count, mean and M2 (sum of squared deviations) of a set of values.
+
+    Moments of separate chunks or partitions are merged exactly with Chan et
+    al.'s pairwise update (merge_moments(), also used by SurveyCube), and a
+    t-test can be run from the summaries alone.
+    """
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self._mean = mean
+        self.m2 = m2
+
+    def merge(self, other):
+        """Fold `other` into these moments (in place) and return self."""
+        count, mean, m2 = merge_moments(self.count, self._mean, self.m2, other.count, other._mean, other.m2)
+        self.count, self._mean, self.m2 = int(count), float(mean), float(m2)
+        return self
+
+    @property
+    def mean(self):
+        return self._mean if self.count else np.nan
+
+    @property
+    def variance(self):
+        """Sample variance (ddof=1)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+
+def welch_ttest(a, b):
+    """Welch's unequal-variance t-test from two RunningMoments.
+
+    Returns (t statistic, two-sided p-value), matching
+    scipy.stats.ttest_ind(..., equal_var=False) on the underlying values.
+    """
+    se_a = a.variance / a.count
+    se_b = b.variance / b.count
+    t_stat = (a.mean - b.mean) / np.sqrt(se_a + se_b)
+    dof = (se_a + se_b) ** 2 / (se_a ** 2 / (a.count - 1) + se_b ** 2 / (b.count - 1))
+    p_value = 2 * stats.t.sf(np.abs(t_stat), dof)
+    return t_stat, p_value
+
+
+# ----------------------------------------------------------------------
+# --- Resampling tests ---
+# Bootstrap and permutation resamples are drawn as whole matrices (one row
+# per resample) and reduced with a single mean per chunk. Chunks get their
+# own seeds spawned from one SeedSequence, so results only depend on the
+# seed and resample count, not on how many worker processes run them.
+
+RESAMPLE_CHUNK_ELEMENTS = 2_000_000  # values drawn per chunk (bounds memory)
+
+
+def resample_chunks(n_resamples, n_values, seed):
+    """Split `n_resamples` into (size, SeedSequence) chunks."""
+    rows = max(1, RESAMPLE_CHUNK_ELEMENTS // max(n_values, 1))
+    n_chunks = -(-n_resamples // rows)
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    return [(min(rows, n_resamples - i * rows), seeds[i]) for i in range(n_chunks)]
+
+
+def bootstrap_chunk(task):
+    a, b, size, seed = task
+    rng = np.random.default_rng(seed)
+    means_a = a[rng.integers(0, len(a), (size, len(a)))].mean(axis=1)
+    means_b = b[rng.integers(0, len(b), (size, len(b)))].mean(axis=1)
+    return means_a - means_b
+
+
+def permutation_chunk(task):
+    pooled, n_a, size, seed = task
+    rng = np.random.default_rng(seed)
+    shuffled = rng.permuted(np.broadcast_to(pooled, (size, len(pooled))), axis=1)
+    return shuffled[:, :n_a].mean(axis=1) - shuffled[:, n_a:].mean(axis=1)
+
+
+def run_chunks(func, tasks, workers=1):
+    """Run resampling chunks in-process, or across a process pool."""
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return np.concatenate(list(pool.map(func, tasks)))
+    return np.concatenate([func(task) for task in tasks])
+
+
+def clean_values(values):
+    values = np.asarray(values, dtype=float)
+    return values[~np.isnan(values)]
+
+
+def bootstrap_mean_diff(a, b, n_resamples=5000, confidence=0.95, seed=0, workers=1):
+    """Percentile bootstrap CI for mean(a) − mean(b).
+
+    Returns (observed difference, lower bound, upper bound).
+    """
+    a, b = clean_values(a), clean_values(b)
+    chunks = resample_chunks(n_resamples, len(a) + len(b), seed)
+    tasks = [(a, b, size, chunk_seed) for size, chunk_seed in chunks]
+    diffs = run_chunks(bootstrap_chunk, tasks, workers)
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(diffs, [tail, 100 - tail])
+    return a.mean() - b.mean(), low, high
+
+
+def permutation_mean_diff(a, b, n_resamples=5000, seed=0, workers=1):
+    """Two-sided permutation test of mean(a) − mean(b).
+
+    Returns (observed difference, p-value), with the +1 correction so the
+    p-value is never exactly zero.
+    """
+    a, b = clean_values(a), clean_values(b)
+    pooled = np.concatenate([a, b])
+    chunks = resample_chunks(n_resamples, len(pooled), seed)
+    tasks = [(pooled, len(a), size, chunk_seed) for size, chunk_seed in chunks]
+    diffs = run_chunks(permutation_chunk, tasks, workers)
+    observed = a.mean() - b.mean()
+    extreme = np.count_nonzero(np.abs(diffs) >= abs(observed) - 1e-12)
+    return observed, (extreme + 1) / (n_resamples + 1)
+
+
+class SurveyCube:
+    """Counts and GPA count / mean / M2 per combination of the categorical dimensions.
+
+    Every breakdown the page shows is a roll-up of these cells (a groupby
+    over a few hundred rows at most) instead of a scan of the student rows.
+    Cells hold the same moments as RunningMoments and are combined with
+    Chan et al.'s update, so newly ingested rows are merged into the existing
+    cells without the cancellation of a sum-of-squares variance. Missing
+    dimension values are kept as their own (NaN) cells so totals still cover
+    every student.
+    """
+
+    DIMENSIONS = tuple(
+        FIELDS[field] for field in (
+            'gender', 'program', 'degree_level', 'program_duration', 'academic_year', 'coaching', 'study_medium'
+        )
+    )
+    METRICS = tuple(FIELDS[field] for field in ('ssc_gpa_norm', 'hsc_gpa_norm', 'overall_gpa'))
+
+    def __init__(self, dimensions=DIMENSIONS, metrics=METRICS, cells=None):
+        self.dimensions = list(dimensions)
+        self.metrics = list(metrics)
+        self.cells = cells
+
+    def add(self, df):
+        """Fold the rows of `df` into the cube and return self.
+
+        The cells are replaced, never modified, so cubes sharing the previous
+        cells (see SurveyAggregates.merged()) are unaffected.
+        """
+        columns = {
+            dim: df[dim].astype(object) if dim in df.columns else pd.Series(np.nan, index=df.index, dtype=object)
+            for dim in self.dimensions
+        }
+        columns['count'] = np.ones(len(df), dtype=np.int64)
+        for metric in self.metrics:
+            if metric in df.columns:
+                columns[metric] = df[metric].to_numpy(dtype=float, na_value=np.nan)
+            else:
+                columns[metric] = np.full(len(df), np.nan)
+
+        grouped = pd.DataFrame(columns, index=df.index).groupby(self.dimensions, dropna=False, sort=False)
+        cells = grouped[['count']].sum()
+        for metric in self.metrics:
+            # pandas' grouped variance is a per-group Welford pass
+            n = grouped[metric].count()
+            cells[f'{metric} n'] = n
+            cells[f'{metric} mean'] = grouped[metric].mean().fillna(0.0)
+            cells[f'{metric} m2'] = (grouped[metric].var(ddof=0) * n).fillna(0.0)
+        if self.cells is not None:
+            cells = self.combine(pd.concat([self.cells, cells]), self.dimensions)
+        self.cells = cells
+        return self
+
+    def combine(self, cells, by):
+        """Cells merged per value of the `by` index levels.
+
+        Chan et al.'s update applied to all parts of a group at once: the
+        merged M2 is the sum of the parts' M2 plus n·(part mean − merged
+        mean)² per part, which equals merging them pairwise.
+        """
+        keys = [cells.index.get_level_values(level) for level in by]
+        grouped = cells.groupby(keys, dropna=False, sort=False)
+        merged = grouped[['count'] + [f'{metric} n' for metric in self.metrics]].sum()
+        for metric in self.metrics:
+            n, mean, m2 = (cells[f'{metric} {stat}'] for stat in ('n', 'mean', 'm2'))
+            weighted = (n * mean).groupby(keys, dropna=False, sort=False)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                group_mean = (weighted.transform('sum') / grouped[f'{metric} n'].transform('sum')).fillna(0.0)
+                merged[f'{metric} mean'] = (weighted.sum() / merged[f'{metric} n']).fillna(0.0)
+            merged[f'{metric} m2'] = (m2 + n * (mean - group_mean) ** 2).groupby(keys, dropna=False, sort=False).sum()
+        merged.index.names = list(by)
+        return merged[self.value_columns()]
+
+    def slice(self, filters):
+        """A cube of the cells matching `filters` ({dimension: [values]})."""
+        cells = self.cells
+        if cells is not None:
+            for dim, values in filters.items():
+                if values:
+                    cells = cells[cells.index.get_level_values(dim).isin(values)]
+        return SurveyCube(self.dimensions, self.metrics, cells)
+
+    def rollup(self, by=()):
+        """Cells merged over every dimension not in `by` (dropping missing `by` values).
+
+        With no `by`, returns the cube totals as a Series.
+        """
+        if self.cells is None or not len(self.cells):
+            return pd.Series(0.0, index=self.value_columns()) if not by else pd.DataFrame(columns=self.value_columns())
+        if not by:
+            totals = self.cells.reset_index(drop=True)
+            totals.index = pd.Index(np.zeros(len(totals), dtype=np.int8), name='all')
+            return self.combine(totals, ['all']).iloc[0]
+        rolled = self.combine(self.cells, by)
+        return rolled[rolled.index.to_frame().notna().all(axis=1).to_numpy()]
+
+    def value_columns(self):
+        return ['count'] + [f'{metric} {stat}' for metric in self.metrics for stat in ('n', 'mean', 'm2')]
+
+    def counts(self, dim):
+        """Students per value of `dim`, largest first."""
+        return self.rollup([dim])['count'].astype(int).sort_values(ascending=False, kind='stable')
+
+    @staticmethod
+    def moments_of(cell, metric):
+        """RunningMoments of `metric` from one roll-up row."""
+        count = int(cell[f'{metric} n'])
+        if not count:
+            return RunningMoments()
+        return RunningMoments(count, float(cell[f'{metric} mean']), float(cell[f'{metric} m2']))
+
+    def moments(self, metric, by=None):
+        """RunningMoments of `metric` overall, or per value of the `by` dimension."""
+        if by is None:
+            return self.moments_of(self.rollup(), metric)
+        rolled = self.rollup([by])
+        return {
+            group: self.moments_of(cell, metric)
+            for group, cell in rolled.iterrows() if cell[f'{metric} n'] > 0
+        }
+
+
+class SurveyAggregates:
+    """Gender/program/year counts, the program × gender crosstab and GPA averages,
+    all rolled up from one SurveyCube."""
+
+    PROGRAM_COLUMN = FIELDS['program']
+    GENDER_COLUMN = FIELDS['gender']
+    COACHING_COLUMN = FIELDS['coaching']
+    COACHING_METRIC = FIELDS['overall_gpa']
+
+    def __init__(self, cube=None):
+        self.cube = cube if cube is not None else SurveyCube()
+
+    def add(self, df):
+        """Fold the rows of `df` (derived columns included) into the aggregates."""
+        self.cube.add(df)
+        return self
+
+    def merged(self, df):
+        """New aggregates of these rows plus `df`; these aggregates are left as they are."""
+        cube = SurveyCube(self.cube.dimensions, self.cube.metrics, self.cube.cells)
+        return SurveyAggregates(cube.add(df))
+
+    def filtered(self, filters):
+        """The aggregates of the students matching `filters`, sliced from the cube."""
+        return SurveyAggregates(self.cube.slice(filters))
+
+    @property
+    def coaching_gpa(self):
+        """{coaching answer: RunningMoments of the Overall GPA}."""
+        return self.cube.moments(self.COACHING_METRIC, by=self.COACHING_COLUMN)
+
+    def value_counts(self, col):
+        """Counts for `col` as a two-column DataFrame, like value_counts().reset_index()."""
+        counts_df = self.cube.counts(col).rename_axis(col).reset_index()
+        counts_df.columns = [col, 'Count']
+        return counts_df
+
+    def program_gender_long(self):
+        """The program × gender crosstab in long (Arts Program, Gender, Count) form."""
+        cross_tab = self.cube.rollup([self.PROGRAM_COLUMN, self.GENDER_COLUMN])['count'].astype(int)
+        cross_tab = cross_tab.unstack(fill_value=0).sort_index().sort_index(axis=1)
+        return cross_tab.rename_axis(index=self.PROGRAM_COLUMN, columns=None).reset_index().melt(
+            id_vars=self.PROGRAM_COLUMN,
+            var_name=self.GENDER_COLUMN,
+            value_name='Count'
+        )
+
+    def gpa_means(self):
+        return {metric: self.cube.moments(metric).mean for metric in self.cube.metrics}
+
+    def coaching_means(self):
+        """Average Overall GPA per coaching answer, like groupby().mean().reset_index()."""
+        coaching_gpa = dict(sorted(self.coaching_gpa.items()))
+        return pd.DataFrame({
+            self.COACHING_COLUMN: list(coaching_gpa),
+            self.COACHING_METRIC: [moments.mean for moments in coaching_gpa.values()],
+        })
@@ -0,0 +1,98 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from survey_data import SNAPSHOT_PATH, TIMESTAMP_COLUMN, TIMESTAMP_FORMAT
+
+# ######################################################################
+# --- SYNTHETIC SURVEYS ---
+# Surveys of any size with the same columns as arts_student_survey_output.csv,
+# for benchmarking (survey_bench.py). Rows are resampled from the real survey,
+# so answers stay correlated the way real students answer; numeric answers
+# are then jittered so large surveys are not just copies of 89 rows:
+#   * Likert-style answers (integral, few levels) move one step up or down
+#     with probability LIKERT_NOISE, staying inside the observed range;
+#   * GPAs get one offset per student (so a student's semesters move
+#     together) plus a small per-answer noise, clipped to the observed range.
+# Timestamps are regenerated one minute apart so the rows stay append-only.
+
+LIKERT_NOISE = 0.15
+LIKERT_MAX_LEVELS = 10
+GPA_STUDENT_NOISE = 0.15
+GPA_ANSWER_NOISE = 0.03
+CHUNK_ROWS = 100_000
+
+
+def load_template(path=SNAPSHOT_PATH):
+    return pd.read_csv(path)
+
+
+def numeric_profiles(template):
+    """{column: (kind, low, high)} for the numeric columns of `template`."""
+    profiles = {}
+    for col in template.columns:
+        if not pd.api.types.is_numeric_dtype(template[col]):
+            continue
+        values = template[col].dropna()
+        if values.empty:
+            continue
+        integral = (values == values.round()).all() and values.nunique() <= LIKERT_MAX_LEVELS
+        profiles[col] = ('likert' if integral else 'gpa', values.min(), values.max())
+    return profiles
+
+
+def synthetic_survey(n_rows, seed=0, template=None, start_row=0):
+    """`n_rows` synthetic survey answers as a DataFrame with the template's columns.
+
+    `start_row` offsets the generated timestamps, so consecutive chunks of
+    one survey (see write_synthetic_csv()) continue each other.
+    """
+    if template is None:
+        template = load_template()
+    rng = np.random.default_rng(seed)
+    df = template.iloc[rng.integers(0, len(template), n_rows)].reset_index(drop=True)
+
+    student_offset = rng.normal(0, GPA_STUDENT_NOISE, n_rows)
+    for col, (kind, low, high) in numeric_profiles(template).items():
+        values = df[col].to_numpy(dtype=float)
+        if kind == 'likert':
+            steps = rng.choice([-1, 0, 1], n_rows, p=[LIKERT_NOISE / 2, 1 - LIKERT_NOISE, LIKERT_NOISE / 2])
+            df[col] = np.clip(values + steps, low, high)
+        else:
+            noise = student_offset + rng.normal(0, GPA_ANSWER_NOISE, n_rows)
+            df[col] = np.clip(values + noise, low, high).round(2)
+
+    if TIMESTAMP_COLUMN in df.columns:
+        first = pd.to_datetime(template[TIMESTAMP_COLUMN], format=TIMESTAMP_FORMAT, errors='coerce').min()
+        minutes = pd.to_timedelta(np.arange(start_row, start_row + n_rows), unit='min')
+        df[TIMESTAMP_COLUMN] = (first + minutes).strftime(TIMESTAMP_FORMAT)
+    return df
+
+
+def write_synthetic_csv(path, n_rows, seed=0, template=None, chunk_rows=CHUNK_ROWS):
+    """Write an `n_rows` synthetic survey to `path`, CHUNK_ROWS rows at a time.
+
+    Each chunk has its own seed derived from `seed`, so memory stays bounded
+    at any size and the file only depends on (n_rows, seed, chunk_rows).
+    """
+    if template is None:
+        template = load_template()
+    seeds = np.random.SeedSequence(seed).spawn(-(-n_rows // chunk_rows))
+    with open(path, 'w', newline='') as f:
+        for i, chunk_seed in enumerate(seeds):
+            start = i * chunk_rows
+            chunk = synthetic_survey(min(chunk_rows, n_rows - start), chunk_seed, template, start_row=start)
+            chunk.to_csv(f, header=(i == 0), index=False)
+    return path
+
+
+if __name__ == "__main__":
+    # python survey_synth.py 1000000 synthetic_1m.csv
+    parser = argparse.ArgumentParser(description="Write a synthetic arts survey CSV.")
+    parser.add_argument('rows', type=int)
+    parser.add_argument('path')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    write_synthetic_csv(args.path, args.rows, args.seed)
+    print(f"Wrote {args.rows:,} rows to {args.path}")
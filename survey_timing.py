@@ -0,0 +1,118 @@
+import functools
+import json
+import time
+from contextlib import contextmanager
+
+import streamlit as st
+
+# ######################################################################
+# --- SECTION TIMINGS ---
+# A small timer API for the hot paths of studentSurvey.py. Each measurement
+# is (section, stage) → wall time, rows processed and, for charts, the
+# serialized figure size. Measurements live in the session state, so the
+# performance panel shows what this browser session actually paid for;
+# a full rerun starts a new set, a fragment rerun replaces its own section.
+# Timing is always on (one perf_counter pair per stage); payload sizes are
+# only measured while the panel is open, since they cost a serialization.
+
+TIMINGS_KEY = '_section_timings'
+PANEL_KEY = 'performance_panel'
+
+
+def timings():
+    return st.session_state.setdefault(TIMINGS_KEY, {})
+
+
+def reset_timings():
+    st.session_state[TIMINGS_KEY] = {}
+
+
+def panel_enabled():
+    return st.session_state.get(PANEL_KEY, False)
+
+
+class Timing:
+    def __init__(self, section, stage, rows=None):
+        self.section = section
+        self.stage = stage
+        self.rows = rows
+        self.payload_bytes = None
+        self.seconds = None
+
+    def as_dict(self):
+        return {
+            'section': self.section,
+            'stage': self.stage,
+            'seconds': self.seconds,
+            'rows': self.rows,
+            'payload_bytes': self.payload_bytes,
+        }
+
+
+@contextmanager
+def timer(section, stage='total', rows=None):
+    """Time the block as `stage` of `section`; set .rows / .payload_bytes on the yielded Timing."""
+    timing = Timing(section, stage, rows)
+    start = time.perf_counter()
+    try:
+        yield timing
+    finally:
+        timing.seconds = time.perf_counter() - start
+        timings()[(section, stage)] = timing.as_dict()
+
+
+def timed_section(section, rows=None):
+    """Decorator timing a whole section; `rows` may be a callable evaluated per call."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(section, rows=rows() if callable(rows) else rows):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def plotly_chart(section, fig, name='chart', **kwargs):
+    """st.plotly_chart(), timed as `section`'s `name` stage (with its payload size when the panel is open)."""
+    payload_bytes = len(fig.to_json()) if panel_enabled() else None
+    with timer(section, name) as timing:
+        timing.payload_bytes = payload_bytes
+        return st.plotly_chart(fig, **kwargs)
+
+
+def timings_report(**meta):
+    """The current measurements as a JSON document (for trend tracking)."""
+    return json.dumps({
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        **meta,
+        'timings': list(timings().values()),
+    }, indent=2, default=str)
+
+
+def performance_panel(**meta):
+    """Sidebar table of this session's timings, with a JSON download."""
+    if not panel_enabled():
+        return
+    records = list(timings().values())
+    with st.sidebar:
+        st.subheader("Performance")
+        if not records:
+            st.caption("No sections measured yet.")
+            return
+        st.dataframe(
+            [{
+                'Section': record['section'],
+                'Stage': record['stage'],
+                'ms': round(record['seconds'] * 1000, 1),
+                'Rows': record['rows'],
+                'Payload (kB)': None if record['payload_bytes'] is None else round(record['payload_bytes'] / 1e3, 1),
+            } for record in records],
+            hide_index=True,
+        )
+        st.caption("Fragment reruns update their own rows; the table refreshes on the next full rerun.")
+        st.download_button(
+            "Download timings (JSON)",
+            timings_report(**meta),
+            file_name='survey_timings.json',
+            mime='application/json',
+        )
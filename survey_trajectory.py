@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from survey_schema import FIELDS, SEMESTER_PATTERN, normalize_header, resolve_schema
+
+# ######################################################################
+# --- SEMESTER TRAJECTORIES ---
+# The twelve "Nth Year Semester M" GPAs as one dense (students × semesters)
+# float32 matrix, in chronological order, with NaN for semesters a student
+# has not taken. Cohort percentiles per semester drive a fan chart whose
+# size depends only on the number of semesters; per-student trends are
+# least-squares lines over each student's own semesters.
+
+FAN_PERCENTILES = (10, 25, 50, 75, 90)
+MIN_TREND_SEMESTERS = 2       # semesters needed for a slope
+MIN_VOLATILITY_SEMESTERS = 3  # ... and for the spread around it
+
+# A student is at risk when their GPA falls by at least AT_RISK_SLOPE per
+# semester over at least AT_RISK_MIN_SEMESTERS semesters
+AT_RISK_SLOPE = -0.05
+AT_RISK_MIN_SEMESTERS = 3
+AT_RISK_COLUMNS = [FIELDS[field] for field in ('gender', 'program', 'degree_level', 'academic_year')]
+
+
+def trajectory_columns(header):
+    """The semester GPA columns of `header` in chronological order (a SECTION_COLUMNS selector)."""
+    return resolve_schema(header).semesters
+
+
+def semester_label(col):
+    """'2nd Year Semester 3' → 'Y2 S3'."""
+    year, semester = SEMESTER_PATTERN.match(normalize_header(col)).groups()
+    return f"Y{year} S{semester}"
+
+
+def semester_matrix(df):
+    """(students × semesters) float32 GPA matrix and its column names."""
+    columns = trajectory_columns(df.columns)
+    return df[columns].to_numpy(dtype=np.float32, na_value=np.nan), columns
+
+
+def semester_summary(matrix, columns, percentiles=FAN_PERCENTILES):
+    """One row per semester: students with a GPA, mean and the `percentiles`."""
+    rows = []
+    for j, col in enumerate(columns):
+        values = matrix[:, j]
+        values = values[~np.isnan(values)]
+        row = {'Semester': semester_label(col), 'Column': col, 'Students': len(values)}
+        row['Mean'] = float(values.mean()) if len(values) else np.nan
+        quantiles = np.percentile(values, percentiles) if len(values) else [np.nan] * len(percentiles)
+        for p, q in zip(percentiles, quantiles):
+            row[f'P{p}'] = float(q)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def student_trends(matrix):
+    """Per-student least-squares GPA line, volatility and latest GPA.
+
+    All students are fitted at once from masked sums over the matrix (a few
+    matrix-vector products, no per-student loop), with semesters numbered
+    0..n-1 so gaps keep their distance. Volatility is the standard deviation
+    of a student's GPAs around their own trend line. Students with too few
+    semesters get NaN. Returns a DataFrame with 'Semesters', 'Slope',
+    'Intercept', 'Volatility' and 'Latest GPA' (the last semester taken).
+    """
+    observed = ~np.isnan(matrix)
+    values = np.where(observed, matrix, 0).astype(np.float64)
+    mask = observed.astype(np.float64)
+    x = np.arange(matrix.shape[1], dtype=np.float64)
+
+    n = mask.sum(axis=1)
+    sum_x = mask @ x
+    sum_xx = mask @ (x * x)
+    sum_y = values.sum(axis=1)
+    sum_xy = values @ x
+    sum_yy = np.einsum('ij,ij->i', values, values)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = (n * sum_xy - sum_x * sum_y) / (n * sum_xx - sum_x * sum_x)
+        intercept = (sum_y - slope * sum_x) / n
+        residual_ss = np.maximum(sum_yy - intercept * sum_y - slope * sum_xy, 0)
+        volatility = np.sqrt(residual_ss / (n - 2))
+
+    slope[n < MIN_TREND_SEMESTERS] = np.nan
+    intercept[n < MIN_TREND_SEMESTERS] = np.nan
+    volatility[n < MIN_VOLATILITY_SEMESTERS] = np.nan
+
+    # Last observed semester: first observed column from the right
+    last = matrix.shape[1] - 1 - np.argmax(observed[:, ::-1], axis=1)
+    latest = matrix[np.arange(len(matrix)), last] if matrix.shape[1] else np.full(len(matrix), np.nan)
+
+    return pd.DataFrame({
+        'Semesters': n.astype(np.int8),
+        'Slope': slope.astype(np.float32),
+        'Intercept': intercept.astype(np.float32),
+        'Volatility': volatility.astype(np.float32),
+        'Latest GPA': latest,
+    })
+
+
+def at_risk_students(df, trends, slope_threshold=AT_RISK_SLOPE, min_semesters=AT_RISK_MIN_SEMESTERS, row_numbers=None):
+    """Students whose GPA trend is at or below `slope_threshold`, steepest decline first.
+
+    `trends` is student_trends() of `df` (same row order); the result keeps
+    the AT_RISK_COLUMNS of `df` that exist next to the trend columns. The
+    'Student' column is the 1-based survey row, taken from `row_numbers`
+    when `df` is a filtered subset (see SurveyView.row_numbers).
+    """
+    flagged = (trends['Slope'] <= slope_threshold) & (trends['Semesters'] >= min_semesters)
+    positions = np.flatnonzero(flagged.to_numpy())
+    info_cols = [col for col in AT_RISK_COLUMNS if col in df.columns]
+    students = df.iloc[positions][info_cols].reset_index(drop=True)
+    row_numbers = np.arange(1, len(df) + 1) if row_numbers is None else np.asarray(row_numbers)
+    students.insert(0, 'Student', row_numbers[positions])
+    students = pd.concat([students, trends.iloc[positions].reset_index(drop=True)], axis=1)
+    return students.sort_values('Slope', kind='stable').reset_index(drop=True)
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def cached_trajectory(data_version, _df):
+    """(semester summary, student trends) computed once per data version."""
+    matrix, columns = semester_matrix(_df)
+    return semester_summary(matrix, columns), student_trends(matrix)
+
+
+def semester_fan_figure(summary, percentiles=FAN_PERCENTILES):
+    """Fan chart: nested percentile bands, the median and the mean per semester.
+
+    The figure holds a fixed number of traces with one point per semester,
+    whatever the number of students.
+    """
+    summary = summary[summary['Students'] > 0]
+    x = summary['Semester']
+    fig = go.Figure()
+
+    # Outer band first, so inner bands draw over it
+    bands = list(zip(percentiles[:len(percentiles) // 2], percentiles[::-1][:len(percentiles) // 2]))
+    for i, (low, high) in enumerate(bands):
+        opacity = 0.15 + 0.2 * i
+        fig.add_trace(go.Scatter(x=x, y=summary[f'P{high}'], mode='lines', line=dict(width=0), showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(
+            x=x,
+            y=summary[f'P{low}'],
+            mode='lines',
+            line=dict(width=0),
+            fill='tonexty',
+            fillcolor=f'rgba(65, 105, 225, {opacity:.2f})',
+            name=f'P{low}–P{high}',
+            hovertemplate=f'P{low}–P{high}<extra></extra>'
+        ))
+
+    fig.add_trace(go.Scatter(
+        x=x, y=summary['P50'], mode='lines+markers', line=dict(color='royalblue', width=2.5), name='Median'
+    ))
+    fig.add_trace(go.Scatter(
+        x=x, y=summary['Mean'], mode='lines', line=dict(color='black', width=1.5, dash='dash'), name='Mean'
+    ))
+    fig.update_layout(
+        title='Semester GPA Trajectory of the Cohort',
+        xaxis_title='Semester',
+        yaxis_title='GPA',
+        yaxis_range=[0, 4.1],
+        hovermode='x unified'
+    )
+    return fig
@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# The survey modules live at the repository root, next to the Streamlit pages
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Ingested snapshots go to a scratch cache, not the repository's .survey_cache
+os.environ.setdefault("SURVEY_CACHE_DIR", tempfile.mkdtemp(prefix='survey-cache-'))
@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from survey_data import COACHING_COLUMN, SNAPSHOT_PATH, LocalFileSource, derive_metrics, ingest_survey
+from survey_hypothesis import batch_group_tests, benjamini_hochberg
+from survey_schema import FIELDS
+from survey_stats import RunningMoments, SurveyAggregates, SurveyCube, welch_ttest
+
+# ######################################################################
+# The vectorized statistics of survey_hypothesis.py and survey_stats.py
+# against scipy.stats (and plain pandas) on the survey shipped with the repo.
+
+RTOL = 1e-6
+
+# scipy warns about its own moment precision on groups of identical answers
+pytestmark = pytest.mark.filterwarnings('ignore:Precision loss occurred:RuntimeWarning')
+
+
+@pytest.fixture(scope='module')
+def survey(tmp_path_factory):
+    """The shipped survey, ingested and derived like the page does."""
+    source = LocalFileSource(SNAPSHOT_PATH)
+    df = ingest_survey(source.version(), source, cache_dir=str(tmp_path_factory.mktemp('cache')))
+    return derive_metrics(df)
+
+
+@pytest.fixture(scope='module')
+def group_tests(survey):
+    return batch_group_tests(survey)
+
+
+def group_values(survey, row):
+    """(group values, rest values) of one batch_group_tests() row, NaN dropped."""
+    labels = survey[row['Factor']].astype(object)
+    present = labels.notna().to_numpy()
+    in_group = present & (labels.astype(str) == row['Group']).to_numpy()
+    values = survey[row['Metric']].to_numpy(dtype=float, na_value=np.nan)
+    group, rest = values[in_group], values[present & ~in_group]
+    return group[~np.isnan(group)], rest[~np.isnan(rest)]
+
+
+def rows_with(group_tests, column):
+    rows = group_tests[group_tests[column].notna()]
+    assert len(rows) > 100
+    return rows.to_dict('records')
+
+
+def test_welch_batch_matches_scipy(survey, group_tests):
+    for row in rows_with(group_tests, 'Welch p'):
+        group, rest = group_values(survey, row)
+        expected = stats.ttest_ind(group, rest, equal_var=False)
+        assert row['n (group)'] == len(group) and row['n (rest)'] == len(rest)
+        np.testing.assert_allclose(
+            [row['Welch t'], row['Welch p']], [expected.statistic, expected.pvalue], rtol=RTOL, equal_nan=True
+        )
+
+
+def test_mannwhitney_batch_matches_scipy(survey, group_tests):
+    # Likert answers and GPAs are heavily tied, so this covers the tie term
+    for row in rows_with(group_tests, 'Mann-Whitney p'):
+        group, rest = group_values(survey, row)
+        expected = stats.mannwhitneyu(group, rest, alternative='two-sided', method='asymptotic', use_continuity=True)
+        np.testing.assert_allclose(
+            [row['Mann-Whitney U'], row['Mann-Whitney p']], [expected.statistic, expected.pvalue],
+            rtol=RTOL, equal_nan=True
+        )
+
+
+def test_benjamini_hochberg_matches_scipy(group_tests):
+    for p_column, q_column in (('Welch p', 'Welch q'), ('Mann-Whitney p', 'Mann-Whitney q')):
+        p_values = group_tests[p_column].to_numpy()
+        q_values = group_tests[q_column].to_numpy()
+        valid = ~np.isnan(p_values)
+        assert np.isnan(q_values[~valid]).all()
+        np.testing.assert_allclose(q_values[valid], stats.false_discovery_control(p_values[valid], method='bh'), rtol=RTOL)
+    np.testing.assert_array_equal(benjamini_hochberg([np.nan]), [np.nan])
+
+
+def test_welch_ttest_matches_scipy(survey):
+    coaching_gpa = SurveyAggregates().add(survey).coaching_gpa
+    gpa = survey[FIELDS['overall_gpa']].astype(float)
+    yes = gpa[survey[COACHING_COLUMN] == 'Yes'].dropna()
+    no = gpa[survey[COACHING_COLUMN] == 'No'].dropna()
+    expected = stats.ttest_ind(yes, no, equal_var=False)
+    np.testing.assert_allclose(welch_ttest(coaching_gpa['Yes'], coaching_gpa['No']), [expected.statistic, expected.pvalue], rtol=RTOL)
+
+
+def test_cube_rollups_match_pandas(survey):
+    aggregates = SurveyAggregates().add(survey)
+
+    for dim in SurveyCube.DIMENSIONS:
+        assert aggregates.cube.counts(dim).to_dict() == survey[dim].astype(object).value_counts().to_dict()
+
+    crosstab = pd.crosstab(survey[FIELDS['program']].astype(object), survey[FIELDS['gender']].astype(object))
+    long_df = aggregates.program_gender_long().pivot(index=FIELDS['program'], columns=FIELDS['gender'], values='Count')
+    np.testing.assert_array_equal(long_df.loc[crosstab.index, crosstab.columns].to_numpy(), crosstab.to_numpy())
+
+    for metric in SurveyCube.METRICS:
+        values = survey[metric].astype(float)
+        expected = values.groupby(survey[COACHING_COLUMN].astype(object)).agg(['count', 'mean', 'var'])
+        for group, moments in aggregates.cube.moments(metric, by=COACHING_COLUMN).items():
+            np.testing.assert_allclose(
+                [moments.count, moments.mean, moments.variance], expected.loc[group].to_numpy(), rtol=RTOL
+            )
+
+
+def test_cube_merges_chunks_exactly(survey):
+    whole = SurveyAggregates().add(survey)
+    chunked = SurveyAggregates()
+    for rows in np.array_split(np.arange(len(survey)), 4):
+        chunked = chunked.merged(survey.iloc[rows])
+
+    for metric in SurveyCube.METRICS:
+        for group, moments in whole.cube.moments(metric, by=FIELDS['program']).items():
+            merged = chunked.cube.moments(metric, by=FIELDS['program'])[group]
+            np.testing.assert_allclose(
+                [merged.count, merged.mean, merged.m2], [moments.count, moments.mean, moments.m2], rtol=RTOL, atol=1e-12
+            )
+
+
+def test_running_moments_merge_chunks_exactly(survey):
+    gpa = survey[FIELDS['overall_gpa']].to_numpy(dtype=float, na_value=np.nan)
+    gpa = gpa[~np.isnan(gpa)]
+    merged = RunningMoments()
+    for chunk in np.array_split(gpa, 5):
+        merged.merge(RunningMoments(len(chunk), chunk.mean(), ((chunk - chunk.mean()) ** 2).sum()))
+    merged.merge(RunningMoments())
+
+    assert merged.count == len(gpa)
+    np.testing.assert_allclose([merged.mean, merged.variance], [gpa.mean(), gpa.var(ddof=1)], rtol=RTOL)
@@ -0,0 +1,36 @@
+from survey_schema import FIELDS, canonical_header, resolve_schema
+from survey_trajectory import semester_label
+
+# ######################################################################
+# Header variants (case, tabs, repeated or trailing whitespace) resolve to
+# the same fields and semester columns as the canonical headers.
+
+SEMESTERS = [f"{year}{suffix} Year Semester {semester}"
+             for year, suffix in ((1, 'st'), (2, 'nd'), (3, 'rd'), (4, 'th')) for semester in (1, 2, 3)]
+
+
+def test_semester_header_variants_are_resolved():
+    variants = {
+        '1st Year Semester 1': '1st Year  Semester 1',
+        '2nd Year Semester 3': '2nd year\tSemester 3 ',
+        '4th Year Semester 2': ' 4TH YEAR SEMESTER 2',
+    }
+    header = ['Timestamp', 'Gender'] + [variants.get(col, col) for col in reversed(SEMESTERS)]
+
+    semesters = resolve_schema(header).semesters
+
+    assert semesters == [variants.get(col, col) for col in SEMESTERS]
+    assert [semester_label(col) for col in semesters[:3]] == ['Y1 S1', 'Y1 S2', 'Y1 S3']
+    assert semester_label('2nd year\tSemester 3 ') == 'Y2 S3'
+
+
+def test_field_header_variants_are_resolved():
+    header = ['timestamp', 'Bachelor Academic Year in EU', 'H.S.C  (GPA)', 'Did you ever attend a Coaching center? ']
+    schema = resolve_schema(header)
+
+    assert schema.bachelor_year == 'Bachelor Academic Year in EU'
+    assert schema.coaching == 'Did you ever attend a Coaching center? '
+    assert schema.hsc_gpa == 'H.S.C  (GPA)'
+    assert [canonical_header(col) for col in header] == [
+        FIELDS['timestamp'], FIELDS['bachelor_year'], FIELDS['hsc_gpa'], FIELDS['coaching']
+    ]
@@ -0,0 +1,125 @@
+import pandas as pd
+import pytest
+
+from survey_data import SNAPSHOT_PATH, TIMESTAMP_COLUMN, LocalFileSource, SurveyStore, likert_columns
+from survey_schema import FIELDS
+
+# ######################################################################
+# SurveyStore on a growing copy of the shipped survey: appended rows are
+# folded in incrementally, anything else is a full reload.
+
+COLUMNS = tuple(FIELDS[field] for field in ('timestamp', 'gender', 'program', 'coaching')) + ('1st Year Semester 1',)
+FIRST_ROWS = 60
+
+
+@pytest.fixture(scope='module')
+def survey_rows():
+    """The shipped survey as text, exactly as it is written back out."""
+    return pd.read_csv(SNAPSHOT_PATH, dtype=str, keep_default_na=False)
+
+
+def write_rows(path, rows):
+    rows.to_csv(path, index=False)
+
+
+def append_rows(path, rows):
+    rows.to_csv(path, mode='a', header=False, index=False)
+
+
+@pytest.fixture
+def reloads(monkeypatch):
+    """Data versions SurveyStore._reload() was called for."""
+    calls = []
+    reload = SurveyStore._reload
+
+    def counting_reload(self, raw, version, source):
+        calls.append(version)
+        return reload(self, raw, version, source)
+
+    monkeypatch.setattr(SurveyStore, '_reload', counting_reload)
+    return calls
+
+
+def full_load(path, columns):
+    return SurveyStore().update(LocalFileSource(str(path)), columns)
+
+
+def assert_same_survey(snapshot, expected):
+    pd.testing.assert_frame_equal(snapshot.frame, expected.frame, check_categorical=False)
+    for dim in snapshot.aggregates.cube.dimensions:
+        assert snapshot.aggregates.cube.counts(dim).to_dict() == expected.aggregates.cube.counts(dim).to_dict()
+    for group, moments in expected.aggregates.coaching_gpa.items():
+        merged = snapshot.aggregates.coaching_gpa[group]
+        assert merged.count == moments.count
+        assert merged.mean == pytest.approx(moments.mean)
+        assert merged.m2 == pytest.approx(moments.m2)
+
+
+def test_appended_rows_are_merged_incrementally(tmp_path, survey_rows, reloads):
+    path = tmp_path / 'survey.csv'
+    write_rows(path, survey_rows[:FIRST_ROWS])
+    store = SurveyStore()
+    before = store.update(LocalFileSource(str(path)), COLUMNS)
+    frame_before = before.frame.copy()
+
+    append_rows(path, survey_rows[FIRST_ROWS:])
+    after = store.update(LocalFileSource(str(path)), COLUMNS)
+
+    assert len(reloads) == 1
+    assert len(after.frame) == len(survey_rows)
+    assert_same_survey(after, full_load(path, COLUMNS))
+    # The previous snapshot is left as it was for sessions still rendering it
+    assert after is not before
+    pd.testing.assert_frame_equal(before.frame, frame_before)
+    assert before.aggregates.cube.counts('Gender').sum() == FIRST_ROWS
+
+
+def test_edited_rows_are_reloaded(tmp_path, survey_rows, reloads):
+    path = tmp_path / 'survey.csv'
+    write_rows(path, survey_rows[:FIRST_ROWS])
+    store = SurveyStore()
+    store.update(LocalFileSource(str(path)), COLUMNS)
+
+    # More rows, but not an append: the first row was removed
+    write_rows(path, survey_rows[1:])
+    after = store.update(LocalFileSource(str(path)), COLUMNS)
+
+    assert len(reloads) == 2
+    assert len(after.frame) == len(survey_rows) - 1
+
+
+def test_survey_without_timestamps_is_reloaded(tmp_path, survey_rows, reloads):
+    path = tmp_path / 'survey.csv'
+    rows = survey_rows.drop(columns=TIMESTAMP_COLUMN)
+    columns = tuple(col for col in COLUMNS if col != TIMESTAMP_COLUMN)
+    write_rows(path, rows[:FIRST_ROWS])
+    store = SurveyStore()
+    before = store.update(LocalFileSource(str(path)), columns)
+    assert TIMESTAMP_COLUMN not in before.frame.columns
+    assert len(before.frame) == FIRST_ROWS
+
+    append_rows(path, rows[FIRST_ROWS:])
+    after = store.update(LocalFileSource(str(path)), columns)
+
+    assert len(reloads) == 2
+    assert_same_survey(after, full_load(path, columns))
+
+
+def test_added_columns_are_joined_onto_the_loaded_rows(tmp_path, survey_rows, reloads):
+    path = tmp_path / 'survey.csv'
+    write_rows(path, survey_rows)
+    source = LocalFileSource(str(path))
+    store = SurveyStore()
+    before = store.update(source, COLUMNS)
+    likert = likert_columns(survey_rows.columns)
+
+    after = store.update(source, likert)
+
+    assert len(reloads) == 1
+    assert after.aggregates is before.aggregates
+    assert set(before.frame.columns) < set(after.frame.columns)
+    assert set(likert) <= set(after.frame.columns)
+    expected = full_load(path, COLUMNS + tuple(likert))
+    pd.testing.assert_frame_equal(after.frame, expected.frame[after.frame.columns], check_categorical=False)
+    # Asking for columns already loaded is answered from the same snapshot
+    assert store.update(source, COLUMNS) is after